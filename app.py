@@ -1,8 +1,11 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from metrices.updater import start_updater
+from starlette.concurrency import run_in_threadpool
+from metrices.simulator import simulator
+from metrices.updater import start_updater, stop_updater
 from utils.logger import logger
 from routes import health, metrics, system, storage
+from utils.responses import ORJSONResponse
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -10,7 +13,8 @@ load_dotenv()
 app = FastAPI(
     title="RMF Monitor III Data Simulator",
     description="Production-ready z/OS metrics simulator with realistic workload patterns",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 app.add_middleware(
@@ -26,6 +30,13 @@ async def on_startup():
     start_updater()
     logger.info("Simulator startup complete.")
 
+@app.on_event("shutdown")
+async def on_shutdown():
+    await stop_updater()
+    # close() flushes the storage buffers and joins the writer threads, keep it off the event loop
+    await run_in_threadpool(simulator.close)
+    logger.info("Simulator shutdown complete.")
+
 # Include routers
 app.include_router(health.router)
 app.include_router(metrics.router)
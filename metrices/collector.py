@@ -0,0 +1,56 @@
+from typing import Dict, Hashable, Iterable, Sequence, Tuple
+
+from prometheus_client.core import GaugeMetricFamily, REGISTRY
+from prometheus_client.registry import Collector
+
+
+class LatestGauge:
+    """Gauge family whose samples are published as whole lists by the simulators"""
+
+    def __init__(self, collector: "LatestValuesCollector", name: str, documentation: str, labelnames: Sequence[str]):
+        self._collector = collector
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def publish(self, key: Hashable, label_values: Sequence[Tuple[str, ...]], values: Sequence[float]):
+        """Replace the samples published under key (usually the LPAR name) in one assignment"""
+        self._collector._latest[(self.name, key)] = (label_values, values)
+
+
+class LatestValuesCollector(Collector):
+    """Builds gauge families from the latest published samples at scrape time"""
+
+    def __init__(self):
+        self._gauges: Dict[str, LatestGauge] = {}
+        # (gauge name, key) -> (label value tuples, values)
+        self._latest: Dict[Tuple[str, Hashable], Tuple[Sequence[Tuple[str, ...]], Sequence[float]]] = {}
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str]) -> LatestGauge:
+        """Declare a gauge family served by this collector"""
+        gauge = LatestGauge(self, name, documentation, labelnames)
+        self._gauges[name] = gauge
+        return gauge
+
+    def describe(self) -> Iterable[GaugeMetricFamily]:
+        """Describe the declared families without samples, so registration never calls collect"""
+        return [self._new_family(gauge) for gauge in self._gauges.values()]
+
+    def collect(self) -> Iterable[GaugeMetricFamily]:
+        """Yield every declared gauge family with its latest samples"""
+        # Copying the dict is atomic under the GIL, publishers never block a scrape
+        latest = self._latest.copy()
+        families = {name: self._new_family(gauge) for name, gauge in self._gauges.items()}
+        for (name, _), (label_values, values) in latest.items():
+            family = families[name]
+            for labels, value in zip(label_values, values):
+                family.add_metric(labels, value)
+        return list(families.values())
+
+    @staticmethod
+    def _new_family(gauge: LatestGauge) -> GaugeMetricFamily:
+        return GaugeMetricFamily(gauge.name, gauge.documentation, labels=gauge.labelnames)
+
+
+latest_values = LatestValuesCollector()
+REGISTRY.register(latest_values)
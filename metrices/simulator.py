@@ -1,10 +1,20 @@
+import asyncio
+import logging
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import List, Optional
 
+import numpy as np
+
 from models.lpar import LPARConfig
+from models.metrics import MetricBatch
+from metrices.simulators.base import BaseMetricSimulator, calculate_time_factor
+from metrices.simulators._kernels import warm_up_kernels
 from metrices.simulators.factory import SimulatorFactory
 from storage.storage_manager import StorageManager
+from utils.clock import tick_clock
 from utils.logger import logger
 from utils.confiig import LPAR_CONFIGS
 
@@ -17,7 +27,8 @@ class MainframeSimulator:
             enable_mysql: bool = True, 
             enable_mongodb: bool = True, 
             enable_s3: bool = True,
-            enabled_simulators: Optional[List[str]] = None
+            enabled_simulators: Optional[List[str]] = None,
+            seed: Optional[int] = None
         ):
         
         self.sysplex_name = sysplex_name
@@ -30,30 +41,62 @@ class MainframeSimulator:
             enable_s3=enable_s3
         )
         
+        # One root seed sequence, the load factor noise and every simulator draw from independent child streams
+        self.seed_sequence = np.random.SeedSequence(seed)
+        noise_seed, simulators_seed = self.seed_sequence.spawn(2)
+        self.rng = np.random.default_rng(noise_seed)
+        
         # Initialize simulator factory
-        self.simulator_factory = SimulatorFactory(sysplex_name)
+        self.simulator_factory = SimulatorFactory(sysplex_name, simulators_seed)
         
-        # Create enabled simulators
+        # Enabled simulators are created on the first simulation tick rather than at import time
         self.enabled_simulators = enabled_simulators or ['cpu', 'memory', 'storage', 'network', 'clpr', 'mpb', 'volumes']
         self.simulators = {}
+        self._simulators_ready = False
+        self._simulators_lock = threading.Lock()
         
-        self._initialize_simulators()
+        # Dedicated pool so LPAR simulation never queues behind other to_thread work
+        self._executor = ThreadPoolExecutor(max_workers=min(32, len(LPAR_CONFIGS)), thread_name_prefix="lpar-sim")
+        
+        warm_up_kernels()
         logger.info(f"MainframeSimulator initialized for {sysplex_name}")
     
     def _initialize_simulators(self):
-        """Initialize the requested simulators"""
-        for simulator_type in self.enabled_simulators:
-            try:
-                self.simulators[simulator_type] = self.simulator_factory.create_simulator(simulator_type)
-                logger.info(f"Initialized {simulator_type} simulator")
-            except Exception as e:
-                logger.error(f"Failed to initialize {simulator_type} simulator: {e}")
+        """Create the enabled simulators once, on first use"""
+        if self._simulators_ready:
+            return
+        
+        # LPAR worker threads may race for the first tick, only one of them builds the simulators
+        with self._simulators_lock:
+            if self._simulators_ready:
+                return
+            for simulator_type in self.enabled_simulators:
+                try:
+                    self.simulators[simulator_type] = self._prepare_simulator(simulator_type)
+                    logger.info(f"Initialized {simulator_type} simulator")
+                except Exception as e:
+                    logger.error(f"Failed to initialize {simulator_type} simulator: {e}")
+            self._simulators_ready = True
+    
+    def _prepare_simulator(self, simulator_type: str) -> BaseMetricSimulator:
+        """Get a simulator with the baselines and label children of every LPAR already resolved"""
+        simulator = self.simulator_factory.get_simulator(simulator_type)
+        for lpar_config in LPAR_CONFIGS:
+            simulator.initialize_baseline(lpar_config)
+        return simulator
     
     def add_simulator(self, simulator_type: str):
         """Add a new simulator type"""
-        if simulator_type not in self.simulators:
+        if simulator_type in self.simulators:
+            return
+        
+        with self._simulators_lock:
             try:
-                self.simulators[simulator_type] = self.simulator_factory.create_simulator(simulator_type)
+                # Before the first tick only the enabled list changes, the simulator is created with the others
+                if self._simulators_ready:
+                    self.simulators[simulator_type] = self._prepare_simulator(simulator_type)
+                elif simulator_type not in self.simulator_factory.get_available_types():
+                    raise ValueError(f"Unknown simulator type: {simulator_type}")
                 if simulator_type not in self.enabled_simulators:
                     self.enabled_simulators.append(simulator_type)
                 logger.info(f"Added {simulator_type} simulator")
@@ -62,52 +105,95 @@ class MainframeSimulator:
     
     def remove_simulator(self, simulator_type: str):
         """Remove a simulator type"""
-        if simulator_type in self.simulators:
-            del self.simulators[simulator_type]
+        with self._simulators_lock:
+            removed = self.simulators.pop(simulator_type, None) is not None
             if simulator_type in self.enabled_simulators:
                 self.enabled_simulators.remove(simulator_type)
+                removed = True
+        if removed:
             logger.info(f"Removed {simulator_type} simulator")
     
-    def simulate_lpar_metrics(self, lpar_config: LPARConfig):
-        """Generate metrics for a single LPAR"""
+    def get_time_factor(self, lpar_config: LPARConfig, timestamp: Optional[datetime] = None,
+                        noise: Optional[float] = None) -> float:
+        """Calculate the time-based load factor shared by all simulators of an LPAR"""
+        return calculate_time_factor(lpar_config, timestamp or datetime.now(), noise)
+    
+    def simulate_lpar_metrics(self, lpar_config: LPARConfig, timestamp: Optional[datetime] = None,
+                              store: bool = True, noise: Optional[float] = None):
+        """Generate metrics for a single LPAR, storing them unless the caller batches storage itself"""
         all_metrics = []
         
+        # One timestamp and load factor per tick keeps every metric family consistent
+        timestamp = timestamp or datetime.now()
+        time_factor = self.get_time_factor(lpar_config, timestamp, noise)
+        
+        self._initialize_simulators()
         for simulator_type, simulator in self.simulators.items():
             try:
-                metrics = simulator.simulate(lpar_config)
+                metrics = simulator.simulate(lpar_config, timestamp, time_factor)
                 all_metrics.extend(metrics)
-                logger.debug(f"Generated {len(metrics)} {simulator_type} metrics for {lpar_config.name}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"Generated {sum(map(len, metrics))} {simulator_type} metrics for {lpar_config.name}")
             except Exception as e:
                 logger.error(f"Error generating {simulator_type} metrics for {lpar_config.name}: {e}")
         
         # Store all metrics
-        if all_metrics:
+        if store and all_metrics:
             try:
                 self.storage_manager.store_metrics(all_metrics)
-                logger.debug(f"Stored {len(all_metrics)} metrics for {lpar_config.name}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"Stored {sum(map(len, all_metrics))} metrics for {lpar_config.name}")
             except Exception as e:
                 logger.error(f"Error storing metrics for {lpar_config.name}: {e}")
         
         return all_metrics
     
+    async def _simulate_one_lpar(self, lpar_config: LPARConfig, timestamp: datetime,
+                                 noise: Optional[float] = None) -> List[MetricBatch]:
+        """Simulate one LPAR in a worker thread, returns its metrics for the cycle's storage batch"""
+        try:
+            loop = asyncio.get_running_loop()
+            metrics = await loop.run_in_executor(
+                self._executor, self.simulate_lpar_metrics, lpar_config, timestamp, False, noise
+            )
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Updated metrics for {lpar_config.name}")
+            return metrics
+        except Exception as e:
+            logger.error(f"Error updating metrics for {lpar_config.name}: {e}")
+            return []
+    
+    async def start(self):
+        """Connect the storage backends without blocking the event loop"""
+        await asyncio.to_thread(self.storage_manager.start)
+    
     async def update_all_metrics(self):
         """Update metrics for all LPARs"""
-        total_metrics = 0
+        # Storage connects on first use rather than at import time
+        if not self.storage_manager.started:
+            await self.start()
         
-        for lpar_config in LPAR_CONFIGS:
-            try:
-                metrics = self.simulate_lpar_metrics(lpar_config)
-                total_metrics += len(metrics)
-                logger.debug(f"Updated metrics for {lpar_config.name}")
-            except Exception as e:
-                logger.error(f"Error updating metrics for {lpar_config.name}: {e}")
+        # Build the simulators before fanning out, so the worker threads never wait on each other
+        self._initialize_simulators()
+        
+        # All LPARs of a cycle share one timestamp, their load factor noise is drawn in one call
+        timestamp = tick_clock.refresh()
+        noise = self.rng.uniform(-0.1, 0.1, size=len(LPAR_CONFIGS)).tolist()
+        
+        # LPARs are independent, simulate them concurrently
+        lpar_metrics = await asyncio.gather(*(
+            self._simulate_one_lpar(lpar_config, timestamp, lpar_noise)
+            for lpar_config, lpar_noise in zip(LPAR_CONFIGS, noise)
+        ))
+        all_metrics = [metric for metrics in lpar_metrics for metric in metrics]
         
-        # Force flush storage after each complete update cycle
+        # Queue every LPAR's batches as one cycle, the storage worker writes them while the next tick runs
         try:
-            self.storage_manager.force_flush()
-            logger.debug(f"Generated and stored {total_metrics} total metrics")
+            self.storage_manager.submit_metrics(all_metrics)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Generated and queued {sum(map(len, all_metrics))} total metrics")
         except Exception as e:
-            logger.error(f"Error flushing storage: {e}")
+            logger.error(f"Error storing metrics: {e}")
     
     def get_simulator_status(self) -> dict:
         """Get status of all simulators"""
@@ -126,6 +212,7 @@ class MainframeSimulator:
     def close(self):
         """Clean up resources"""
         try:
+            self._executor.shutdown(wait=True)
             self.storage_manager.close()
             logger.info("MainframeSimulator closed successfully")
         except Exception as e:
@@ -139,7 +226,8 @@ def create_simulator_from_env() -> MainframeSimulator:
         enable_mysql=os.getenv("ENABLE_MYSQL", "true").lower() == "true",
         enable_mongodb=os.getenv("ENABLE_MONGO", "true").lower() == "true", 
         enable_s3=os.getenv("ENABLE_S3", "true").lower() == "true",
-        enabled_simulators=os.getenv("ENABLED_SIMULATORS", "cpu,memory,storage,network,clpr,mpb,volumes").split(",")
+        enabled_simulators=os.getenv("ENABLED_SIMULATORS", "cpu,memory,storage,network,clpr,mpb,volumes").split(","),
+        seed=int(os.environ["SIMULATOR_SEED"]) if os.getenv("SIMULATOR_SEED") else None
     )
 
 
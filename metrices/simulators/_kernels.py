@@ -0,0 +1,99 @@
+import os
+
+import numpy as np
+
+from utils.logger import logger
+
+# NUMBA_DISABLE_JIT=1 skips numba entirely and runs the kernels as plain Python
+JIT_DISABLED = os.getenv("NUMBA_DISABLE_JIT", "0") == "1"
+
+njit = None
+if not JIT_DISABLED:
+    try:
+        from numba import njit
+    except ImportError:  # numba is optional, fall back to plain Python
+        pass
+
+JIT_ENABLED = njit is not None
+
+if not JIT_ENABLED:
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+
+# Explicit signatures compile (or load from the on-disk cache) at import time
+@njit("f8(i8, i8, i8, i8, b1, b1, f8)", cache=True)
+def time_factor_kernel(hour, weekday, day, peak_mask, is_online, is_batch, noise):
+    """Combine peak, weekday, month-end and noise factors into one load factor"""
+    # Peak hours factor
+    if (peak_mask >> hour) & 1:
+        peak_factor = 1.4 if is_online else 1.8
+    elif is_batch:
+        peak_factor = 0.3
+    else:
+        peak_factor = 1.0
+
+    # Weekly pattern (Monday = higher load)
+    weekday_factor = 1.2 if weekday == 0 else 1.0
+
+    # Monthly pattern (month-end spike)
+    month_end_factor = 1.5 if day >= 28 else 1.0
+
+    return peak_factor * weekday_factor * month_end_factor * (1.0 + noise)
+
+
+@njit("UniTuple(f8, 3)(f8, f8)", cache=True)
+def cpu_utilization_kernel(base_util, time_factor):
+    """Return clamped (general purpose, zIIP, zAAP) utilization percentages"""
+    gp_util = base_util * time_factor
+    if gp_util > 95.0:
+        gp_util = 95.0
+
+    # With GP capped at 95%, zIIP (<= 57%) and zAAP (<= 38%) stay below their 75%/70% ceilings
+    return gp_util, gp_util * 0.6, gp_util * 0.4
+
+
+# Array kernels release the GIL, so the LPAR worker threads run them in parallel
+@njit("Tuple((f8[::1], f8[::1]))(f8, f8, f8[:, ::1], f8[::1], f8[::1])", cache=True, nogil=True)
+def clpr_kernel(base_service_time, time_factor, uniforms, rate_low, rate_high):
+    """Return clamped CF link service times and request rates, all links of one request type after another"""
+    # uniforms holds [0, 1) draws, row 0 for the service time noise, then one row per request type
+    link_count = uniforms.shape[1]
+    type_count = rate_low.size
+    service_times = np.empty(link_count)
+    request_rates = np.empty(type_count * link_count)
+    
+    for i in range(link_count):
+        # Service time (microseconds) with -30%..+50% noise, clamped between 5-200μs
+        service_time = base_service_time * time_factor * (0.7 + 0.8 * uniforms[0, i])
+        service_times[i] = min(max(service_time, 5.0), 200.0)
+    
+    for t in range(type_count):
+        span = rate_high[t] - rate_low[t]
+        for i in range(link_count):
+            request_rates[t * link_count + i] = (rate_low[t] + span * uniforms[t + 1, i]) * time_factor
+    
+    return service_times, request_rates
+
+
+@njit("f8[::1](f8[::1], f8, f8[::1], f8, f8, f8, f8)", cache=True, nogil=True)
+def scaled_noise_kernel(bases, time_factor, uniforms, noise_low, noise_high, clip_low, clip_high):
+    """Return bases * time_factor * (1 + noise) clamped to [clip_low, clip_high], noise spread from [0, 1) draws"""
+    values = np.empty(bases.size)
+    noise_span = noise_high - noise_low
+    for i in range(bases.size):
+        value = bases[i] * time_factor * (1.0 + noise_low + noise_span * uniforms[i])
+        values[i] = min(max(value, clip_low), clip_high)
+    return values
+
+
+def warm_up_kernels():
+    """Run every kernel once so the first simulation tick never pays compile cost"""
+    time_factor_kernel(0, 0, 1, 0, True, False, 0.0)
+    cpu_utilization_kernel(0.0, 1.0)
+    clpr_kernel(0.0, 1.0, np.zeros((2, 1)), np.zeros(1), np.ones(1))
+    scaled_noise_kernel(np.zeros(1), 1.0, np.zeros(1), 0.0, 0.0, 0.0, 1.0)
+    logger.info(f"Simulation kernels ready ({'numba JIT' if JIT_ENABLED else 'pure Python'})")
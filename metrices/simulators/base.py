@@ -1,26 +1,80 @@
+import zlib
 from abc import ABC, abstractmethod
 from datetime import datetime
-from typing import Dict, Any, List, Optional
-import random
+from typing import Dict, Any, List, Optional, Tuple
 
+import numpy as np
+
+from metrices.simulators._kernels import time_factor_kernel
 from models.lpar import LPARConfig
+from models.metrics import MetricBatch
+from utils.clock import tick_clock
 from utils.logger import logger
 
+# PCG64 generator for callers that do not pass a pre-drawn noise value, numpy serializes access across threads
+_rng = np.random.default_rng()
+
+# (peak mask, workload type, hour, weekday, month end) -> load factor without noise, at most a few thousand entries
+_load_factors: Dict[Tuple[int, str, int, int, bool], float] = {}
+
+
+def calculate_time_factor(lpar_config: LPARConfig, timestamp: datetime, noise: Optional[float] = None) -> float:
+    """Calculate the time-based performance factor of an LPAR, noise is drawn in [-0.1, 0.1) unless given"""
+    peak_mask = lpar_config.peak_mask
+    
+    # Only the noise changes between ticks of the same hour, memoize the deterministic part
+    hour, weekday, day = timestamp.hour, timestamp.weekday(), timestamp.day
+    key = (peak_mask, lpar_config.workload_type, hour, weekday, day >= 28)
+    load_factor = _load_factors.get(key)
+    if load_factor is None:
+        load_factor = _load_factors[key] = time_factor_kernel(
+            hour, weekday, day, peak_mask,
+            lpar_config.workload_type == "online",
+            lpar_config.workload_type == "batch",
+            0.0
+        )
+    
+    if noise is None:
+        noise = float(_rng.uniform(-0.1, 0.1))
+    return load_factor * (1.0 + noise)  # Seasonal noise
+
 
 class BaseMetricSimulator(ABC):
     """Base class for all metric simulators"""
+    # Simulators live for the whole process, slots keep their per-instance state compact
+    __slots__ = ('sysplex_name', 'base_values', 'trend_factors', 'metric_children', 'seed_sequence', 'rngs')
     
     def __init__(self, sysplex_name: str):
         self.sysplex_name = sysplex_name
         self.base_values = {}
         self.trend_factors = {}
+        self.metric_children = {}
+        self.seed_sequence = np.random.SeedSequence()
+        self.rngs: Dict[str, np.random.Generator] = {}
+    
+    def seed(self, seed_sequence: np.random.SeedSequence):
+        """Reseed the simulator, every LPAR gets its own stream derived from this sequence"""
+        self.seed_sequence = seed_sequence
+        self.rngs = {name: self._lpar_rng(name) for name in self.rngs}
+    
+    def _lpar_rng(self, lpar_name: str) -> np.random.Generator:
+        """Derive the generator of one LPAR, keyed by its name so it does not depend on creation order"""
+        sequence = self.seed_sequence
+        child = np.random.SeedSequence(
+            sequence.entropy, spawn_key=sequence.spawn_key + (zlib.crc32(lpar_name.encode()),)
+        )
+        return np.random.default_rng(child)
     
     def initialize_baseline(self, lpar_config: LPARConfig) -> Dict[str, float]:
-        """Initialize baseline values for an LPAR"""
-        if lpar_config.name not in self.base_values:
-            self.base_values[lpar_config.name] = self._get_default_baselines(lpar_config)
-            self.trend_factors[lpar_config.name] = self._get_default_trend_factors()
-        return self.base_values[lpar_config.name]
+        """Initialize baseline values for an LPAR and return them"""
+        base_values = self.base_values.get(lpar_config.name)
+        if base_values is None:
+            # LPARs are simulated concurrently, a generator per LPAR keeps seeded runs reproducible
+            rng = self.rngs[lpar_config.name] = self._lpar_rng(lpar_config.name)
+            base_values = self.base_values[lpar_config.name] = self._get_default_baselines(lpar_config)
+            self.trend_factors[lpar_config.name] = self._get_default_trend_factors(rng)
+            self.metric_children[lpar_config.name] = self._create_metric_children(lpar_config)
+        return base_values
     
     def _get_default_baselines(self, lpar_config: LPARConfig) -> Dict[str, float]:
         """Override in subclasses to provide specific baseline values"""
@@ -31,40 +85,30 @@ class BaseMetricSimulator(ABC):
             'cf_base': 25.0,
         }
     
-    def _get_default_trend_factors(self) -> Dict[str, float]:
+    def _create_metric_children(self, lpar_config: LPARConfig) -> Dict[str, Any]:
+        """Override in subclasses to resolve Prometheus label children and label value tuples once per LPAR"""
+        return {}
+    
+    def _get_default_trend_factors(self, rng: np.random.Generator) -> Dict[str, float]:
         """Default trend factors for cyclical patterns"""
+        daily, weekly, monthly = rng.uniform([0.8, 0.9, 0.95], [1.2, 1.1, 1.05]).tolist()
         return {
-            'daily_cycle': random.uniform(0.8, 1.2),
-            'weekly_cycle': random.uniform(0.9, 1.1),
-            'monthly_cycle': random.uniform(0.95, 1.05),
+            'daily_cycle': daily,
+            'weekly_cycle': weekly,
+            'monthly_cycle': monthly,
         }
     
-    def get_time_factor(self, lpar_config: LPARConfig) -> float:
+    def get_time_factor(self, lpar_config: LPARConfig, timestamp: Optional[datetime] = None) -> float:
         """Calculate time-based performance factor"""
-        now = datetime.now()
-        current_hour = now.hour
-        
-        # Peak hours factor
-        peak_factor = 1.0
-        if current_hour in lpar_config.peak_hours:
-            peak_factor = 1.4 if lpar_config.workload_type == "online" else 1.8
-        elif lpar_config.workload_type == "batch" and current_hour not in lpar_config.peak_hours:
-            peak_factor = 0.3
-        
-        # Weekly pattern (Monday = higher load)
-        weekday_factor = 1.2 if now.weekday() == 0 else 1.0
-        
-        # Monthly pattern (month-end spike)
-        month_end_factor = 1.5 if now.day >= 28 else 1.0
-        
-        # Seasonal noise
-        noise_factor = 1.0 + (random.uniform(-0.1, 0.1))
-        
-        return peak_factor * weekday_factor * month_end_factor * noise_factor
+        return calculate_time_factor(lpar_config, timestamp or datetime.now())
+    
+    def get_row_base(self, lpar_config: LPARConfig, timestamp: datetime) -> Tuple[str, str, str]:
+        """Build the (timestamp, sysplex, lpar) fields shared by every metric batch of a tick"""
+        return (tick_clock.isoformat(timestamp), self.sysplex_name, lpar_config.name)
     
     @abstractmethod
-    def simulate(self, lpar_config: LPARConfig) -> List[Dict[str, Any]]:
-        """Generate a list of metrics for the given LPAR configuration"""
+    def simulate(self, lpar_config: LPARConfig, timestamp: datetime, time_factor: float) -> List[MetricBatch]:
+        """Generate one metric batch per metric family for the given LPAR configuration at one tick"""
         pass
     
     @abstractmethod
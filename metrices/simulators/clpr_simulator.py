@@ -1,20 +1,33 @@
-import random
+import logging
 from datetime import datetime
 from typing import Dict, Any, List
 
+import numpy as np
+
 from metrices.definitions import CLPR_SERVICE_TIME, CLPR_REQUEST_RATE
 from models.lpar import LPARConfig
+from models.metrics import MetricBatch
 from metrices.simulators.base import BaseMetricSimulator
+from metrices.simulators._kernels import clpr_kernel
 from utils.logger import logger
 
 
 class CLPRMetricSimulator(BaseMetricSimulator):
     """Simulator for Coupling Facility Link Performance metrics"""
+    __slots__ = ('cf_links', 'request_types', 'request_rate_low', 'request_rate_high', 'request_rate_links', 'request_rate_types')
     
     def __init__(self, sysplex_name: str):
         super().__init__(sysplex_name)
         self.cf_links = [f"CF{i:02d}" for i in range(1, 5)]
         self.request_types = ["synchronous", "asynchronous"]
+        
+        # Request rate ranges per request type, in self.request_types order
+        self.request_rate_low = np.array([1000.0, 500.0])
+        self.request_rate_high = np.array([10000.0, 3000.0])
+        
+        # (cf_link, request_type) columns of the request rate batch, all synchronous links first
+        self.request_rate_links = self.cf_links * len(self.request_types)
+        self.request_rate_types = [request_type for request_type in self.request_types for _ in self.cf_links]
     
     def _get_default_baselines(self, lpar_config: LPARConfig) -> Dict[str, float]:
         """CLPR-specific baseline values"""
@@ -26,76 +39,61 @@ class CLPRMetricSimulator(BaseMetricSimulator):
         })
         return base
     
-    def simulate(self, lpar_config: LPARConfig) -> List[Dict[str, Any]]:
-        """Generate CLPR metrics for an LPAR"""
-        self.initialize_baseline(lpar_config)
-        
-        time_factor = self.get_time_factor(lpar_config)
-        base_service_time = self.base_values[lpar_config.name]['cf_service_time_base']
-        timestamp = datetime.now()
-        metrics = []
-        
-        for cf_link in self.cf_links:
-            # Service time (microseconds)
-            service_time = base_service_time * time_factor * (1 + random.uniform(-0.3, 0.5))
-            service_time = max(5.0, min(200.0, service_time))  # Clamp between 5-200μs
-            
-            # Update Prometheus metrics
+    def _create_metric_children(self, lpar_config: LPARConfig) -> Dict[str, Any]:
+        """Resolve CF link histogram children and request rate label values for every link"""
+        # Histogram children in self.cf_links order, so observing is a single zip over the kernel output
+        service_time = tuple(
             CLPR_SERVICE_TIME.labels(
                 sysplex=self.sysplex_name,
                 lpar=lpar_config.name,
                 cf_link=cf_link
-            ).observe(service_time)
-            
-            # Request rates by type
-            sync_rate = random.uniform(1000, 10000) * time_factor
-            async_rate = random.uniform(500, 3000) * time_factor
-            
-            CLPR_REQUEST_RATE.labels(
-                sysplex=self.sysplex_name,
-                lpar=lpar_config.name,
-                cf_link=cf_link,
-                request_type="synchronous"
-            ).set(sync_rate)
-            
-            CLPR_REQUEST_RATE.labels(
-                sysplex=self.sysplex_name,
-                lpar=lpar_config.name,
-                cf_link=cf_link,
-                request_type="asynchronous"
-            ).set(async_rate)
-            
-            # Prepare metrics for storage
-            metrics.extend([
-                {
-                    'timestamp': timestamp.isoformat(),
-                    'sysplex': self.sysplex_name,
-                    'lpar': lpar_config.name,
-                    'cf_link': cf_link,
-                    'service_time_microseconds': service_time,
-                    'metric_type': 'clpr_service_time'
-                },
-                {
-                    'timestamp': timestamp.isoformat(),
-                    'sysplex': self.sysplex_name,
-                    'lpar': lpar_config.name,
-                    'cf_link': cf_link,
-                    'request_type': 'synchronous',
-                    'request_rate': sync_rate,
-                    'metric_type': 'clpr_request_rate'
-                },
-                {
-                    'timestamp': timestamp.isoformat(),
-                    'sysplex': self.sysplex_name,
-                    'lpar': lpar_config.name,
-                    'cf_link': cf_link,
-                    'request_type': 'asynchronous',
-                    'request_rate': async_rate,
-                    'metric_type': 'clpr_request_rate'
-                }
-            ])
+            )
+            for cf_link in self.cf_links
+        )
+        # All synchronous links first, then all asynchronous links
+        request_rate = tuple(
+            (self.sysplex_name, lpar_config.name, cf_link, request_type)
+            for request_type in self.request_types
+            for cf_link in self.cf_links
+        )
+        return {'service_time': service_time, 'request_rate': request_rate}
+    
+    def simulate(self, lpar_config: LPARConfig, timestamp: datetime, time_factor: float) -> List[MetricBatch]:
+        """Generate CLPR metrics for an LPAR"""
+        base_service_time = self.initialize_baseline(lpar_config)['cf_service_time_base']
+        rng = self.rngs[lpar_config.name]
+        row_base = self.get_row_base(lpar_config, timestamp)
+        children = self.metric_children[lpar_config.name]
+        count = len(self.cf_links)
+        
+        # One draw for the service time noise and every request type, scaled and clamped in a single kernel call
+        uniforms = rng.random((1 + len(self.request_types), count))
+        service_time_values, request_rate_values = clpr_kernel(
+            base_service_time, time_factor, uniforms, self.request_rate_low, self.request_rate_high
+        )
+        service_times = service_time_values.tolist()
+        request_rates = request_rate_values.tolist()
+        
+        # Update Prometheus metrics, request rates follow the order of their label values
+        for child, service_time in zip(children['service_time'], service_times):
+            child.observe(service_time)
+        CLPR_REQUEST_RATE.publish(lpar_config.name, children['request_rate'], request_rates)
+        
+        # Prepare metrics for storage
+        metrics = [
+            MetricBatch('clpr_service_time', *row_base, {
+                'cf_link': self.cf_links,
+                'service_time_microseconds': service_times
+            }),
+            MetricBatch('clpr_request_rate', *row_base, {
+                'cf_link': self.request_rate_links,
+                'request_type': self.request_rate_types,
+                'request_rate': request_rates
+            })
+        ]
         
-        logger.debug(f"CLPR metrics updated for {lpar_config.name}: {len(metrics)} metrics generated")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"CLPR metrics updated for {lpar_config.name}: {sum(map(len, metrics))} metrics generated")
         return metrics
     
     def get_metric_type(self) -> str:
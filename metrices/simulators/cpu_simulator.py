@@ -1,61 +1,51 @@
+import logging
 from datetime import datetime
 from typing import Dict, Any, List
 
 from metrices.definitions import CPU_UTILIZATION
 from models.lpar import LPARConfig
+from models.metrics import MetricBatch
 from metrices.simulators.base import BaseMetricSimulator
+from metrices.simulators._kernels import cpu_utilization_kernel
 from utils.logger import logger
 
 
 class CPUMetricSimulator(BaseMetricSimulator):
     """Simulator for CPU utilization metrics"""
+    __slots__ = ('cpu_types',)
     
     def __init__(self, sysplex_name: str):
         super().__init__(sysplex_name)
         self.cpu_types = ["general_purpose", "ziip", "zaap"]
     
-    def simulate(self, lpar_config: LPARConfig) -> List[Dict[str, Any]]:
+    def _create_metric_children(self, lpar_config: LPARConfig) -> Dict[str, Any]:
+        """Build CPU gauge label values for each CPU type"""
+        return {
+            'utilization': tuple((self.sysplex_name, lpar_config.name, cpu_type) for cpu_type in self.cpu_types)
+        }
+    
+    def simulate(self, lpar_config: LPARConfig, timestamp: datetime, time_factor: float) -> List[MetricBatch]:
         """Generate CPU metrics for an LPAR"""
-        self.initialize_baseline(lpar_config)
-        
-        time_factor = self.get_time_factor(lpar_config)
-        base_util = self.base_values[lpar_config.name]['cpu_base']
-        timestamp = datetime.now()
+        base_util = self.initialize_baseline(lpar_config)['cpu_base']
+        row_base = self.get_row_base(lpar_config, timestamp)
         
-        # General purpose CPU utilization
-        gp_util = min(95.0, base_util * time_factor)
+        # General purpose and specialty engine (zIIP/zAAP) utilization
+        gp_util, ziip_util, zaap_util = cpu_utilization_kernel(base_util, time_factor)
         
-        # Specialty engine utilization (zIIP/zAAP)
-        ziip_util = min(75.0, gp_util * 0.6)
-        zaap_util = min(70.0, gp_util * 0.4)
-        
-        cpu_values = {
-            "general_purpose": gp_util,
-            "ziip": ziip_util,
-            "zaap": zaap_util
-        }
+        # Values in self.cpu_types order
+        utilizations = [gp_util, ziip_util, zaap_util]
         
         # Update Prometheus metrics
-        for cpu_type, utilization in cpu_values.items():
-            CPU_UTILIZATION.labels(
-                sysplex=self.sysplex_name,
-                lpar=lpar_config.name,
-                cpu_type=cpu_type
-            ).set(utilization)
+        children = self.metric_children[lpar_config.name]
+        CPU_UTILIZATION.publish(lpar_config.name, children['utilization'], utilizations)
         
         # Prepare metrics for storage
-        metrics = []
-        for cpu_type, utilization in cpu_values.items():
-            metrics.append({
-                'timestamp': timestamp.isoformat(),
-                'sysplex': self.sysplex_name,
-                'lpar': lpar_config.name,
-                'cpu_type': cpu_type,
-                'utilization_percent': utilization,
-                'metric_type': self.get_metric_type()
-            })
+        metrics = [
+            MetricBatch('cpu_utilization', *row_base, {'cpu_type': self.cpu_types, 'utilization_percent': utilizations})
+        ]
         
-        logger.debug(f"CPU metrics updated for {lpar_config.name}: GP={gp_util:.1f}%, zIIP={ziip_util:.1f}%")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"CPU metrics updated for {lpar_config.name}: GP={gp_util:.1f}%, zIIP={ziip_util:.1f}%")
         return metrics
     
     def get_metric_type(self) -> str:
@@ -1,4 +1,7 @@
-from typing import Dict, List, Type
+from typing import Dict, List, Optional, Type
+
+import numpy as np
+
 from metrices.simulators.base import BaseMetricSimulator
 from metrices.simulators.cpu_simulator import CPUMetricSimulator
 from metrices.simulators.memory_simulator import MemoryMetricSimulator
@@ -13,8 +16,10 @@ from utils.logger import logger
 class SimulatorFactory:
     """Factory for creating and managing metric simulators"""
     
-    def __init__(self, sysplex_name: str):
+    def __init__(self, sysplex_name: str, seed_sequence: Optional[np.random.SeedSequence] = None):
         self.sysplex_name = sysplex_name
+        # Every created simulator gets a child stream of this sequence, seeded from OS entropy by default
+        self.seed_sequence = seed_sequence or np.random.SeedSequence()
         self._simulators: Dict[str, BaseMetricSimulator] = {}
         self._available_simulators = {
             'cpu': CPUMetricSimulator,
@@ -33,7 +38,9 @@ class SimulatorFactory:
         
         if simulator_type not in self._simulators:
             simulator_class = self._available_simulators[simulator_type]
-            self._simulators[simulator_type] = simulator_class(self.sysplex_name)
+            simulator = simulator_class(self.sysplex_name)
+            simulator.seed(self.seed_sequence.spawn(1)[0])
+            self._simulators[simulator_type] = simulator
             logger.info(f"Created {simulator_type} simulator")
         
         return self._simulators[simulator_type]
@@ -44,13 +51,6 @@ class SimulatorFactory:
             return self.create_simulator(simulator_type)
         return self._simulators[simulator_type]
     
-    def get_all_simulators(self) -> Dict[str, BaseMetricSimulator]:
-        """Get all simulator instances, creating them if necessary"""
-        for simulator_type in self._available_simulators:
-            if simulator_type not in self._simulators:
-                self.create_simulator(simulator_type)
-        return self._simulators.copy()
-    
     def register_simulator(self, name: str, simulator_class: Type[BaseMetricSimulator]):
         """Register a new simulator type"""
         self._available_simulators[name] = simulator_class
@@ -1,67 +1,73 @@
-import random
+import logging
 from datetime import datetime
 from typing import Dict, Any, List
 
 from metrices.definitions import MEMORY_USAGE
 from models.lpar import LPARConfig
+from models.metrics import MetricBatch
 from metrices.simulators.base import BaseMetricSimulator
 from utils.logger import logger
 
 
 class MemoryMetricSimulator(BaseMetricSimulator):
     """Simulator for memory usage metrics"""
+    __slots__ = ('memory_types',)
     
     def __init__(self, sysplex_name: str):
         super().__init__(sysplex_name)
         self.memory_types = ["real_storage", "virtual_storage", "csa"]
     
-    def simulate(self, lpar_config: LPARConfig) -> List[Dict[str, Any]]:
-        """Generate memory metrics for an LPAR"""
-        self.initialize_baseline(lpar_config)
-        
-        time_factor = self.get_time_factor(lpar_config)
-        base_util = self.base_values[lpar_config.name]['memory_base']
-        timestamp = datetime.now()
-        
-        # Calculate memory usage
-        memory_util = min(0.90, base_util * time_factor)
-        total_memory = lpar_config.memory_gb * 1024 * 1024 * 1024  # Convert to bytes
-        used_memory = int(total_memory * memory_util)
+    def _get_default_baselines(self, lpar_config: LPARConfig) -> Dict[str, float]:
+        """Memory-specific baseline values"""
+        base = super()._get_default_baselines(lpar_config)
+        total_memory = lpar_config.memory_gb << 30  # Convert GB to bytes
         
         # Virtual storage (typically 3-10x real storage)
         virtual_multiplier = 4.0 if lpar_config.workload_type == "online" else 6.0
-        virtual_memory = int(total_memory * virtual_multiplier)
+        
+        base.update({
+            'total_memory_bytes': total_memory,
+            'virtual_memory_bytes': int(total_memory * virtual_multiplier)
+        })
+        return base
+    
+    def _create_metric_children(self, lpar_config: LPARConfig) -> Dict[str, Any]:
+        """Build memory gauge label values for each memory type"""
+        return {
+            'usage': tuple((self.sysplex_name, lpar_config.name, memory_type) for memory_type in self.memory_types)
+        }
+    
+    def simulate(self, lpar_config: LPARConfig, timestamp: datetime, time_factor: float) -> List[MetricBatch]:
+        """Generate memory metrics for an LPAR"""
+        base_values = self.initialize_baseline(lpar_config)
+        rng = self.rngs[lpar_config.name]
+        base_util = base_values['memory_base']
+        row_base = self.get_row_base(lpar_config, timestamp)
+        
+        # Calculate memory usage
+        memory_util = base_util * time_factor
+        if memory_util > 0.90:
+            memory_util = 0.90
+        used_memory = int(base_values['total_memory_bytes'] * memory_util)
+        virtual_memory = base_values['virtual_memory_bytes']
         
         # Common Service Area (CSA)
-        csa_memory = random.randint(200_000_000, 800_000_000)  # 200-800MB
+        csa_memory = int(rng.integers(200_000_000, 800_000_001))  # 200-800MB
         
-        memory_values = {
-            "real_storage": used_memory,
-            "virtual_storage": virtual_memory,
-            "csa": csa_memory
-        }
+        # Values in self.memory_types order
+        usages = [used_memory, virtual_memory, csa_memory]
         
         # Update Prometheus metrics
-        for memory_type, usage in memory_values.items():
-            MEMORY_USAGE.labels(
-                sysplex=self.sysplex_name,
-                lpar=lpar_config.name,
-                memory_type=memory_type
-            ).set(usage)
+        children = self.metric_children[lpar_config.name]
+        MEMORY_USAGE.publish(lpar_config.name, children['usage'], usages)
         
         # Prepare metrics for storage
-        metrics = []
-        for memory_type, usage in memory_values.items():
-            metrics.append({
-                'timestamp': timestamp.isoformat(),
-                'sysplex': self.sysplex_name,
-                'lpar': lpar_config.name,
-                'memory_type': memory_type,
-                'usage_bytes': usage,
-                'metric_type': self.get_metric_type()
-            })
+        metrics = [
+            MetricBatch('memory_usage', *row_base, {'memory_type': self.memory_types, 'usage_bytes': usages})
+        ]
         
-        logger.debug(f"Memory metrics updated for {lpar_config.name}: Real={used_memory//1024//1024}MB")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Memory metrics updated for {lpar_config.name}: Real={used_memory//1024//1024}MB")
         return metrics
     
     def get_metric_type(self) -> str:
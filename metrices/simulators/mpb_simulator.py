@@ -1,15 +1,20 @@
-import random
+import logging
 from datetime import datetime
 from typing import Dict, Any, List
 
+import numpy as np
+
 from metrices.definitions import MPB_PROCESSING_RATE, MPB_QUEUE_DEPTH
 from models.lpar import LPARConfig
+from models.metrics import MetricBatch
 from metrices.simulators.base import BaseMetricSimulator
+from metrices.simulators._kernels import scaled_noise_kernel
 from utils.logger import logger
 
 
 class MPBMetricSimulator(BaseMetricSimulator):
     """Simulator for Message Processing Block metrics"""
+    __slots__ = ('queue_types', 'base_rates', 'base_rate_values')
     
     def __init__(self, sysplex_name: str):
         super().__init__(sysplex_name)
@@ -20,59 +25,56 @@ class MPBMetricSimulator(BaseMetricSimulator):
             "MQ": 2000,
             "BATCH": 500
         }
+        self.base_rate_values = np.array(
+            [self.base_rates.get(queue_type, 1000) for queue_type in self.queue_types], dtype=np.float64
+        )
+    
+    def _create_metric_children(self, lpar_config: LPARConfig) -> Dict[str, Any]:
+        """Build MPB gauge label values for each queue type"""
+        labels = tuple((self.sysplex_name, lpar_config.name, queue_type) for queue_type in self.queue_types)
+        return {'processing_rate': labels, 'queue_depth': labels}
     
-    def simulate(self, lpar_config: LPARConfig) -> List[Dict[str, Any]]:
+    def simulate(self, lpar_config: LPARConfig, timestamp: datetime, time_factor: float) -> List[MetricBatch]:
         """Generate MPB metrics for an LPAR"""
         self.initialize_baseline(lpar_config)
+        rng = self.rngs[lpar_config.name]
+        
+        row_base = self.get_row_base(lpar_config, timestamp)
+        children = self.metric_children[lpar_config.name]
+        count = len(self.queue_types)
+        
+        # Processing rate varies by queue type and workload, at least 100
+        processing_rate_values = scaled_noise_kernel(
+            self.base_rate_values, time_factor, rng.random(count), -0.2, 0.3, 100.0, np.inf
+        )
+        
+        # Queue depth increases with load, computed in place on the drawn load factors
+        queue_depth_values = rng.uniform(0.1, 0.5, size=count)
+        queue_depth_values *= processing_rate_values
+        queue_depth_values /= 1000
+        queue_depth_values = queue_depth_values.astype(np.int64)
+        np.maximum(queue_depth_values, 1, out=queue_depth_values)
+        queue_depths = queue_depth_values.tolist()
+        processing_rates = processing_rate_values.tolist()
         
-        time_factor = self.get_time_factor(lpar_config)
-        timestamp = datetime.now()
-        metrics = []
+        # Update Prometheus metrics
+        MPB_PROCESSING_RATE.publish(lpar_config.name, children['processing_rate'], processing_rates)
+        MPB_QUEUE_DEPTH.publish(lpar_config.name, children['queue_depth'], queue_depths)
         
-        for queue_type in self.queue_types:
-            # Processing rate varies by queue type and workload
-            base_rate = self.base_rates.get(queue_type, 1000)
-            
-            processing_rate = base_rate * time_factor * (1 + random.uniform(-0.2, 0.3))
-            processing_rate = max(100, processing_rate)
-            
-            # Queue depth increases with load
-            queue_depth = max(1, int(processing_rate / 1000 * random.uniform(0.1, 0.5)))
-            
-            # Update Prometheus metrics
-            MPB_PROCESSING_RATE.labels(
-                sysplex=self.sysplex_name,
-                lpar=lpar_config.name,
-                queue_type=queue_type
-            ).set(processing_rate)
-            
-            MPB_QUEUE_DEPTH.labels(
-                sysplex=self.sysplex_name,
-                lpar=lpar_config.name,
-                queue_type=queue_type
-            ).set(queue_depth)
-            
-            # Prepare metrics for storage
-            metrics.extend([
-                {
-                    'timestamp': timestamp.isoformat(),
-                    'sysplex': self.sysplex_name,
-                    'lpar': lpar_config.name,
-                    'queue_type': queue_type,
-                    'processing_rate': processing_rate,
-                    'metric_type': 'mpb_processing_rate'
-                },
-                {
-                    'timestamp': timestamp.isoformat(),
-                    'sysplex': self.sysplex_name,
-                    'lpar': lpar_config.name,
-                    'queue_type': queue_type,
-                    'queue_depth': queue_depth,
-                    'metric_type': 'mpb_queue_depth'
-                }
-            ])
+        # Prepare metrics for storage
+        metrics = [
+            MetricBatch('mpb_processing_rate', *row_base, {
+                'queue_type': self.queue_types,
+                'processing_rate': processing_rates
+            }),
+            MetricBatch('mpb_queue_depth', *row_base, {
+                'queue_type': self.queue_types,
+                'queue_depth': queue_depths
+            })
+        ]
         
-        logger.debug(f"MPB metrics updated for {lpar_config.name}: {len(metrics)} metrics generated")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"MPB metrics updated for {lpar_config.name}: {sum(map(len, metrics))} metrics generated")
         return metrics
     
     def get_metric_type(self) -> str:
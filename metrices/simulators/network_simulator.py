@@ -1,15 +1,20 @@
-import random
+import logging
 from datetime import datetime
 from typing import Dict, Any, List
 
+import numpy as np
+
 from metrices.definitions import PORTS_UTILIZATION, PORTS_THROUGHPUT
 from models.lpar import LPARConfig
+from models.metrics import MetricBatch
 from metrices.simulators.base import BaseMetricSimulator
+from metrices.simulators._kernels import scaled_noise_kernel
 from utils.logger import logger
 
 
 class NetworkMetricSimulator(BaseMetricSimulator):
     """Simulator for network port metrics"""
+    __slots__ = ('port_types', 'port_ids', 'flat_port_types', 'flat_port_ids', 'util_bases', 'max_throughputs')
     
     def __init__(self, sysplex_name: str):
         super().__init__(sysplex_name)
@@ -18,65 +23,67 @@ class NetworkMetricSimulator(BaseMetricSimulator):
             "Hipersocket": {"count": 2, "max_throughput": 10000, "base_util": 15.0},
             "FICON": {"count": 8, "max_throughput": 400, "base_util": 45.0},
         }
+        self.port_ids = {
+            port_type: [f"{port_type}_{i:02d}" for i in range(config["count"])]
+            for port_type, config in self.port_types.items()
+        }
+        
+        # Flat per-port layout so a whole tick is computed with one vector expression
+        counts = [config["count"] for config in self.port_types.values()]
+        self.flat_port_types = [port_type for port_type, count in zip(self.port_types, counts) for _ in range(count)]
+        self.flat_port_ids = [port_id for port_ids in self.port_ids.values() for port_id in port_ids]
+        self.util_bases = np.repeat([config["base_util"] for config in self.port_types.values()], counts)
+        self.max_throughputs = np.repeat([config["max_throughput"] for config in self.port_types.values()], counts)
+    
+    def _create_metric_children(self, lpar_config: LPARConfig) -> Dict[str, Any]:
+        """Build port gauge label values for every port, in flat port order"""
+        labels = tuple(
+            (self.sysplex_name, lpar_config.name, port_type, port_id)
+            for port_type, port_id in zip(self.flat_port_types, self.flat_port_ids)
+        )
+        return {'utilization': labels, 'throughput': labels}
     
-    def simulate(self, lpar_config: LPARConfig) -> List[Dict[str, Any]]:
+    def simulate(self, lpar_config: LPARConfig, timestamp: datetime, time_factor: float) -> List[MetricBatch]:
         """Generate network port metrics for an LPAR"""
         self.initialize_baseline(lpar_config)
+        rng = self.rngs[lpar_config.name]
+        
+        row_base = self.get_row_base(lpar_config, timestamp)
+        children = self.metric_children[lpar_config.name]
+        count = len(self.flat_port_ids)
+        
+        # Utilization, clamped between 5-85%
+        utilization_values = scaled_noise_kernel(
+            self.util_bases, time_factor, rng.random(count), -0.4, 0.6, 5.0, 85.0
+        )
+        
+        # Throughput, scaled and floored in place on a single temporary
+        throughput_values = self.max_throughputs * utilization_values
+        throughput_values /= 100.0
+        np.maximum(throughput_values, 1.0, out=throughput_values)
+        throughputs = throughput_values.tolist()
+        utilizations = utilization_values.tolist()
         
-        time_factor = self.get_time_factor(lpar_config)
-        timestamp = datetime.now()
-        metrics = []
+        # Update Prometheus metrics
+        PORTS_UTILIZATION.publish(lpar_config.name, children['utilization'], utilizations)
+        PORTS_THROUGHPUT.publish(lpar_config.name, children['throughput'], throughputs)
         
-        for port_type, config in self.port_types.items():
-            for i in range(config["count"]):
-                port_id = f"{port_type}_{i:02d}"
-                
-                # Utilization
-                utilization = config["base_util"] * time_factor * (1 + random.uniform(-0.4, 0.6))
-                utilization = max(5.0, min(85.0, utilization))
-                
-                # Throughput
-                throughput = config["max_throughput"] * (utilization / 100.0)
-                throughput = max(1.0, throughput)
-                
-                # Update Prometheus metrics
-                PORTS_UTILIZATION.labels(
-                    sysplex=self.sysplex_name,
-                    lpar=lpar_config.name,
-                    port_type=port_type,
-                    port_id=port_id
-                ).set(utilization)
-                
-                PORTS_THROUGHPUT.labels(
-                    sysplex=self.sysplex_name,
-                    lpar=lpar_config.name,
-                    port_type=port_type,
-                    port_id=port_id
-                ).set(throughput)
-                
-                # Prepare metrics for storage
-                metrics.extend([
-                    {
-                        'timestamp': timestamp.isoformat(),
-                        'sysplex': self.sysplex_name,
-                        'lpar': lpar_config.name,
-                        'port_type': port_type,
-                        'port_id': port_id,
-                        'utilization_percent': utilization,
-                        'metric_type': 'ports_utilization'
-                    },
-                    {
-                        'timestamp': timestamp.isoformat(),
-                        'sysplex': self.sysplex_name,
-                        'lpar': lpar_config.name,
-                        'port_type': port_type,
-                        'port_id': port_id,
-                        'throughput_mbps': throughput,
-                        'metric_type': 'ports_throughput'
-                    }
-                ])
+        # Prepare metrics for storage
+        metrics = [
+            MetricBatch('ports_utilization', *row_base, {
+                'port_type': self.flat_port_types,
+                'port_id': self.flat_port_ids,
+                'utilization_percent': utilizations
+            }),
+            MetricBatch('ports_throughput', *row_base, {
+                'port_type': self.flat_port_types,
+                'port_id': self.flat_port_ids,
+                'throughput_mbps': throughputs
+            })
+        ]
         
-        logger.debug(f"Network metrics updated for {lpar_config.name}: {len(metrics)} metrics generated")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Network metrics updated for {lpar_config.name}: {sum(map(len, metrics))} metrics generated")
         return metrics
     
     def get_metric_type(self) -> str:
@@ -1,15 +1,20 @@
-import random
+import logging
 from datetime import datetime
 from typing import Dict, Any, List
 
+import numpy as np
+
 from metrices.definitions import LDEV_RESPONSE_TIME, LDEV_UTILIZATION
 from models.lpar import LPARConfig
+from models.metrics import MetricBatch
 from metrices.simulators.base import BaseMetricSimulator
+from metrices.simulators._kernels import scaled_noise_kernel
 from utils.logger import logger
 
 
 class StorageMetricSimulator(BaseMetricSimulator):
     """Simulator for LDEV (storage device) metrics"""
+    __slots__ = ('device_types', 'device_ids', 'flat_device_types', 'flat_device_ids', 'response_bases', 'util_bases')
     
     def __init__(self, sysplex_name: str):
         super().__init__(sysplex_name)
@@ -18,61 +23,72 @@ class StorageMetricSimulator(BaseMetricSimulator):
             "flashcopy": {"count": 8, "response_base": 2.0, "util_base": 55.0},
             "tape": {"count": 12, "response_base": 45.0, "util_base": 25.0},
         }
+        self.device_ids = {
+            device_type: [f"{device_type}_{i:02d}" for i in range(config["count"])]
+            for device_type, config in self.device_types.items()
+        }
+        
+        # Flat per-device layout so a whole tick is computed with one vector expression
+        counts = [config["count"] for config in self.device_types.values()]
+        self.flat_device_types = [device_type for device_type, count in zip(self.device_types, counts) for _ in range(count)]
+        self.flat_device_ids = [device_id for device_ids in self.device_ids.values() for device_id in device_ids]
+        # Response time bases are configured in milliseconds but simulated directly in seconds
+        self.response_bases = np.repeat([config["response_base"] for config in self.device_types.values()], counts) / 1000.0
+        self.util_bases = np.repeat([config["util_base"] for config in self.device_types.values()], counts)
     
-    def simulate(self, lpar_config: LPARConfig) -> List[Dict[str, Any]]:
+    def _create_metric_children(self, lpar_config: LPARConfig) -> Dict[str, Any]:
+        """Resolve LDEV histogram children and gauge label values for every device, in flat device order"""
+        response_time = {
+            device_type: LDEV_RESPONSE_TIME.labels(
+                sysplex=self.sysplex_name,
+                lpar=lpar_config.name,
+                device_type=device_type
+            )
+            for device_type in self.device_types
+        }
+        return {
+            'response_time': tuple(response_time[device_type] for device_type in self.flat_device_types),
+            'utilization': tuple((self.sysplex_name, lpar_config.name, device_id) for device_id in self.flat_device_ids)
+        }
+    
+    def simulate(self, lpar_config: LPARConfig, timestamp: datetime, time_factor: float) -> List[MetricBatch]:
         """Generate LDEV metrics for an LPAR"""
         self.initialize_baseline(lpar_config)
+        rng = self.rngs[lpar_config.name]
+        
+        row_base = self.get_row_base(lpar_config, timestamp)
+        children = self.metric_children[lpar_config.name]
+        count = len(self.flat_device_ids)
+        
+        # Response time calculation in seconds, clamped between 1-100ms
+        response_times = scaled_noise_kernel(
+            self.response_bases, time_factor, rng.random(count), -0.2, 0.3, 0.001, 0.1
+        ).tolist()
+        
+        # Utilization calculation, clamped between 5-95%
+        utilizations = scaled_noise_kernel(
+            self.util_bases, time_factor, rng.random(count), -0.3, 0.4, 5.0, 95.0
+        ).tolist()
         
-        time_factor = self.get_time_factor(lpar_config)
-        timestamp = datetime.now()
-        metrics = []
+        # Update Prometheus metrics
+        for response_time_child, response_time in zip(children['response_time'], response_times):
+            response_time_child.observe(response_time)
+        LDEV_UTILIZATION.publish(lpar_config.name, children['utilization'], utilizations)
         
-        for device_type, config in self.device_types.items():
-            for i in range(config["count"]):
-                device_id = f"{device_type}_{i:02d}"
-                
-                # Response time calculation
-                response_time = config["response_base"] * time_factor * (1 + random.uniform(-0.2, 0.3))
-                response_time = max(1.0, min(100.0, response_time))  # Clamp between 1-100ms
-                
-                # Utilization calculation
-                utilization = config["util_base"] * time_factor * (1 + random.uniform(-0.3, 0.4))
-                utilization = max(5.0, min(95.0, utilization))  # Clamp between 5-95%
-                
-                # Update Prometheus metrics
-                LDEV_RESPONSE_TIME.labels(
-                    sysplex=self.sysplex_name,
-                    lpar=lpar_config.name,
-                    device_type=device_type
-                ).observe(response_time / 1000.0)  # Convert to seconds
-                
-                LDEV_UTILIZATION.labels(
-                    sysplex=self.sysplex_name,
-                    lpar=lpar_config.name,
-                    device_id=device_id
-                ).set(utilization)
-                
-                # Prepare metrics for storage
-                metrics.extend([
-                    {
-                        'timestamp': timestamp.isoformat(),
-                        'sysplex': self.sysplex_name,
-                        'lpar': lpar_config.name,
-                        'device_type': device_type,
-                        'response_time_seconds': response_time / 1000.0,
-                        'metric_type': 'ldev_response_time'
-                    },
-                    {
-                        'timestamp': timestamp.isoformat(),
-                        'sysplex': self.sysplex_name,
-                        'lpar': lpar_config.name,
-                        'device_id': device_id,
-                        'utilization_percent': utilization,
-                        'metric_type': 'ldev_utilization'
-                    }
-                ])
+        # Prepare metrics for storage
+        metrics = [
+            MetricBatch('ldev_response_time', *row_base, {
+                'device_type': self.flat_device_types,
+                'response_time_seconds': response_times
+            }),
+            MetricBatch('ldev_utilization', *row_base, {
+                'device_id': self.flat_device_ids,
+                'utilization_percent': utilizations
+            })
+        ]
         
-        logger.debug(f"Storage metrics updated for {lpar_config.name}: {len(metrics)} metrics generated")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Storage metrics updated for {lpar_config.name}: {sum(map(len, metrics))} metrics generated")
         return metrics
     
     def get_metric_type(self) -> str:
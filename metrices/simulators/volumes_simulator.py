@@ -1,15 +1,20 @@
-import random
+import logging
 from datetime import datetime
 from typing import Dict, Any, List
 
+import numpy as np
+
 from metrices.definitions import VOLUMES_UTILIZATION, VOLUMES_IOPS
 from models.lpar import LPARConfig
+from models.metrics import MetricBatch
 from metrices.simulators.base import BaseMetricSimulator
+from metrices.simulators._kernels import scaled_noise_kernel
 from utils.logger import logger
 
 
 class VolumesMetricSimulator(BaseMetricSimulator):
     """Simulator for volume utilization and IOPS metrics"""
+    __slots__ = ('volume_types', 'volume_ids', 'flat_volume_types', 'flat_volume_ids', 'util_bases', 'iops_bases')
     
     def __init__(self, sysplex_name: str):
         super().__init__(sysplex_name)
@@ -19,65 +24,65 @@ class VolumesMetricSimulator(BaseMetricSimulator):
             "USER": {"count": 25, "base_util": 35.0, "base_iops": 600},
             "TEMP": {"count": 8, "base_util": 25.0, "base_iops": 400},
         }
+        self.volume_ids = {
+            volume_type: [f"{volume_type}{i:03d}" for i in range(config["count"])]
+            for volume_type, config in self.volume_types.items()
+        }
+        
+        # Flat per-volume layout so a whole tick is computed with one vector expression
+        counts = [config["count"] for config in self.volume_types.values()]
+        self.flat_volume_types = [volume_type for volume_type, count in zip(self.volume_types, counts) for _ in range(count)]
+        self.flat_volume_ids = [volume_id for volume_ids in self.volume_ids.values() for volume_id in volume_ids]
+        self.util_bases = np.repeat([config["base_util"] for config in self.volume_types.values()], counts)
+        self.iops_bases = np.repeat([config["base_iops"] for config in self.volume_types.values()], counts).astype(np.float64)
+    
+    def _create_metric_children(self, lpar_config: LPARConfig) -> Dict[str, Any]:
+        """Build volume gauge label values for every volume, in flat volume order"""
+        labels = tuple(
+            (self.sysplex_name, lpar_config.name, volume_type, volume_id)
+            for volume_type, volume_id in zip(self.flat_volume_types, self.flat_volume_ids)
+        )
+        return {'utilization': labels, 'iops': labels}
     
-    def simulate(self, lpar_config: LPARConfig) -> List[Dict[str, Any]]:
+    def simulate(self, lpar_config: LPARConfig, timestamp: datetime, time_factor: float) -> List[MetricBatch]:
         """Generate volume metrics for an LPAR"""
         self.initialize_baseline(lpar_config)
+        rng = self.rngs[lpar_config.name]
+        
+        row_base = self.get_row_base(lpar_config, timestamp)
+        children = self.metric_children[lpar_config.name]
+        count = len(self.flat_volume_ids)
+        
+        # Utilization
+        utilizations = scaled_noise_kernel(
+            self.util_bases, time_factor, rng.random(count), -0.3, 0.4, 10.0, 90.0
+        ).tolist()
+        
+        # IOPS, at least 50 (truncating after the floor equals flooring the truncated value)
+        iops_values = scaled_noise_kernel(
+            self.iops_bases, time_factor, rng.random(count), -0.4, 0.6, 50.0, np.inf
+        ).astype(np.int64).tolist()
         
-        time_factor = self.get_time_factor(lpar_config)
-        timestamp = datetime.now()
-        metrics = []
+        # Update Prometheus metrics
+        VOLUMES_UTILIZATION.publish(lpar_config.name, children['utilization'], utilizations)
+        VOLUMES_IOPS.publish(lpar_config.name, children['iops'], iops_values)
         
-        for volume_type, config in self.volume_types.items():
-            for i in range(config["count"]):
-                volume_id = f"{volume_type}{i:03d}"
-                
-                # Utilization
-                utilization = config["base_util"] * time_factor * (1 + random.uniform(-0.3, 0.4))
-                utilization = max(10.0, min(90.0, utilization))
-                
-                # IOPS
-                iops = config["base_iops"] * time_factor * (1 + random.uniform(-0.4, 0.6))
-                iops = max(50, int(iops))
-                
-                # Update Prometheus metrics
-                VOLUMES_UTILIZATION.labels(
-                    sysplex=self.sysplex_name,
-                    lpar=lpar_config.name,
-                    volume_type=volume_type,
-                    volume_id=volume_id
-                ).set(utilization)
-                
-                VOLUMES_IOPS.labels(
-                    sysplex=self.sysplex_name,
-                    lpar=lpar_config.name,
-                    volume_type=volume_type,
-                    volume_id=volume_id
-                ).set(iops)
-                
-                # Prepare metrics for storage
-                metrics.extend([
-                    {
-                        'timestamp': timestamp.isoformat(),
-                        'sysplex': self.sysplex_name,
-                        'lpar': lpar_config.name,
-                        'volume_type': volume_type,
-                        'volume_id': volume_id,
-                        'utilization_percent': utilization,
-                        'metric_type': 'volumes_utilization'
-                    },
-                    {
-                        'timestamp': timestamp.isoformat(),
-                        'sysplex': self.sysplex_name,
-                        'lpar': lpar_config.name,
-                        'volume_type': volume_type,
-                        'volume_id': volume_id,
-                        'iops': iops,
-                        'metric_type': 'volumes_iops'
-                    }
-                ])
+        # Prepare metrics for storage
+        metrics = [
+            MetricBatch('volumes_utilization', *row_base, {
+                'volume_type': self.flat_volume_types,
+                'volume_id': self.flat_volume_ids,
+                'utilization_percent': utilizations
+            }),
+            MetricBatch('volumes_iops', *row_base, {
+                'volume_type': self.flat_volume_types,
+                'volume_id': self.flat_volume_ids,
+                'iops': iops_values
+            })
+        ]
         
-        logger.debug(f"Volumes metrics updated for {lpar_config.name}: {len(metrics)} metrics generated")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Volumes metrics updated for {lpar_config.name}: {sum(map(len, metrics))} metrics generated")
         return metrics
     
     def get_metric_type(self) -> str:
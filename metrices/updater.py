@@ -1,8 +1,13 @@
 import asyncio
+from typing import Optional
 from metrices.simulator import simulator
 from utils.logger import logger
 
+_updater_task: Optional[asyncio.Task] = None
+
 def start_updater():
+    global _updater_task
+
     async def metrics_updater():
         while True:
             try:
@@ -12,4 +17,16 @@ def start_updater():
                 logger.error(f"Error updating metrics: {e}")
             await asyncio.sleep(15)
 
-    asyncio.create_task(metrics_updater())
+    _updater_task = asyncio.create_task(metrics_updater())
+
+async def stop_updater():
+    """Cancel the updater and wait for it, so no cycle is half-submitted when storage shuts down"""
+    global _updater_task
+    if _updater_task is None:
+        return
+    _updater_task.cancel()
+    try:
+        await _updater_task
+    except asyncio.CancelledError:
+        pass
+    _updater_task = None
@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import List
 
 @dataclass
@@ -8,3 +8,8 @@ class LPARConfig:
     memory_gb: int
     workload_type: str
     peak_hours: List[int]
+    # peak_hours (0-23) as a 24-bit mask, so a peak hour test is a single bit test
+    peak_mask: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.peak_mask = sum(1 << hour for hour in set(self.peak_hours))
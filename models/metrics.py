@@ -0,0 +1,25 @@
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List
+
+
+@dataclass(slots=True)
+class MetricBatch:
+    """Column-oriented samples of one metric family for one LPAR at one tick"""
+    metric_type: str
+    timestamp: str
+    sysplex: str
+    lpar: str
+    # Metric specific columns of equal length, e.g. {'cpu_type': [...], 'utilization_percent': [...]}
+    columns: Dict[str, List[Any]]
+
+    def __len__(self) -> int:
+        return len(next(iter(self.columns.values()), ()))
+
+    def records(self) -> Iterator[Dict[str, Any]]:
+        """Expand the batch into one dict per sample"""
+        names = tuple(self.columns)
+        for values in zip(*self.columns.values()):
+            record = {'timestamp': self.timestamp, 'sysplex': self.sysplex, 'lpar': self.lpar}
+            record.update(zip(names, values))
+            record['metric_type'] = self.metric_type
+            yield record
@@ -5,12 +5,12 @@ router = APIRouter()
 
 @router.get("/health")
 async def health():
-    return {"status": "healthy", "timestamp": datetime.now().isoformat()}
+    return {"status": "healthy", "timestamp": datetime.now()}
 
 @router.get("/ready")
 async def ready():
-    return {"status": "ready", "timestamp": datetime.now().isoformat()}
+    return {"status": "ready", "timestamp": datetime.now()}
 
 @router.get("/startup")
 async def startup():
-    return {"status": "started", "timestamp": datetime.now().isoformat()}
+    return {"status": "started", "timestamp": datetime.now()}
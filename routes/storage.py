@@ -1,54 +1,74 @@
 from datetime import datetime
-from typing import Optional
-from fastapi import APIRouter, HTTPException, Query
+from typing import Callable, Iterator, Optional
+import orjson
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
 from storage.mongodb.service import MongoDBService
 from utils.logger import logger
 from storage.mysql.service import DatabaseService
 from storage.S3.s3 import S3StorageService
+from storage.services import get_database_service, get_mongo_service, get_s3_service
 
+try:
+    import msgpack
+except ImportError:  # msgpack is optional, S3 metrics are then always streamed as NDJSON
+    msgpack = None
+
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+
+# Services are injected per request, so importing the router never connects to a backend
 router = APIRouter()
-db = DatabaseService()
-mongo = MongoDBService()
-s3 = S3StorageService()
+
+def _encode_ndjson(metric: dict) -> bytes:
+    return orjson.dumps(metric, default=str) + b"\n"
+
+def _msgpack_default(value):
+    # Same ISO strings orjson writes for datetimes
+    return value.isoformat() if isinstance(value, datetime) else str(value)
+
+def _encode_msgpack(metric: dict) -> bytes:
+    # Concatenated msgpack maps, read back with msgpack.Unpacker
+    return msgpack.packb(metric, use_bin_type=True, default=_msgpack_default)
 
 @router.get("/database-summary")
-async def get_database_summary():
+async def get_database_summary(db: DatabaseService = Depends(get_database_service)):
     """Get database metrics summary"""
     try:
         summary = db.get_metrics_summary()
         return {
             "database_status": "connected",
             "metrics_summary": summary,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": datetime.now()
         }
     except Exception as e:
         logger.error(f"Error getting database summary: {e}")
         return {
             "database_status": "error",
             "error": str(e),
-            "timestamp": datetime.now().isoformat()
+            "timestamp": datetime.now()
         }
 
 @router.post("/cleanup-old-data")
-async def cleanup_old_data(days_to_keep: int = 90):
+async def cleanup_old_data(days_to_keep: int = 90, db: DatabaseService = Depends(get_database_service)):
     """Clean up old data beyond retention period"""
     try:
         db.cleanup_old_data(days_to_keep)
         return {
             "status": "success",
             "message": f"Cleaned up data older than {days_to_keep} days",
-            "timestamp": datetime.now().isoformat()
+            "timestamp": datetime.now()
         }
     except Exception as e:
         logger.error(f"Error cleaning up old data: {e}")
         return {
             "status": "error",
             "error": str(e),
-            "timestamp": datetime.now().isoformat()
+            "timestamp": datetime.now()
         }
 
 @router.get("/mongodb-summary")
-async def mongodb_summary():
+async def mongodb_summary(mongo: MongoDBService = Depends(get_mongo_service)):
     """Get MongoDB metrics summary"""
     try:
         summary = mongo.get_metrics_summary()
@@ -57,7 +77,12 @@ async def mongodb_summary():
         return {"error": str(e)}
 
 @router.get("/mongodb-latest/{sysplex}")
-async def get_latest_mongodb_metrics(sysplex: str, lpar: str = None, limit: int = 100):
+async def get_latest_mongodb_metrics(
+    sysplex: str,
+    lpar: str = None,
+    limit: int = 100,
+    mongo: MongoDBService = Depends(get_mongo_service)
+):
     """Get latest metrics from MongoDB"""
     try:
         metrics = mongo.get_latest_metrics(sysplex, lpar, limit)
@@ -66,14 +91,14 @@ async def get_latest_mongodb_metrics(sysplex: str, lpar: str = None, limit: int
         return {"error": str(e)}
 
 @router.get("/storage/s3/statistics")
-async def get_s3_statistics():
+async def get_s3_statistics(s3: S3StorageService = Depends(get_s3_service)):
     """Get S3 storage statistics"""
     try:
         stats = s3.get_storage_statistics()
         return {
             "status": "success",
             "statistics": stats,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": datetime.now()
         }
         
     except Exception as e:
@@ -87,11 +112,13 @@ async def get_s3_metrics(
     lpar: Optional[str] = Query(None),
     start_time: Optional[datetime] = Query(None),
     end_time: Optional[datetime] = Query(None),
-    limit: int = Query(100, le=10000)
+    limit: int = Query(100, le=10000),
+    accept: Optional[str] = Header(None),
+    s3: S3StorageService = Depends(get_s3_service)
 ):
-    """Retrieve metrics from S3 storage"""
+    """Stream metrics from S3 storage as newline-delimited JSON, or msgpack when requested via Accept"""
     try:
-        metrics = s3.retrieve_metrics(
+        metrics = s3.iter_metrics(
             metric_type=metric_type,
             sysplex=sysplex,
             lpar=lpar,
@@ -99,28 +126,36 @@ async def get_s3_metrics(
             end_time=end_time,
             limit=limit
         )
-        
-        return {
-            "status": "success",
-            "metric_type": metric_type,
-            "count": len(metrics),
-            "metrics": metrics,
-            "filters": {
-                "sysplex": sysplex,
-                "lpar": lpar,
-                "start_time": start_time.isoformat() if start_time else None,
-                "end_time": end_time.isoformat() if end_time else None,
-                "limit": limit
-            },
-            "timestamp": datetime.now().isoformat()
-        }
-        
+        # Pull the first metric before responding, so listing errors still return a 500
+        first_metric = await run_in_threadpool(next, metrics, None)
     except Exception as e:
         logger.error(f"Error retrieving S3 metrics: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to retrieve metrics: {str(e)}")
+    
+    encode: Callable[[dict], bytes] = _encode_ndjson
+    media_type = "application/x-ndjson"
+    if msgpack is not None and accept and MSGPACK_MEDIA_TYPE in accept:
+        encode, media_type = _encode_msgpack, MSGPACK_MEDIA_TYPE
+    
+    def encoded_metrics() -> Iterator[bytes]:
+        if first_metric is None:
+            return
+        try:
+            yield encode(first_metric)
+            for metric in metrics:
+                yield encode(metric)
+        except Exception as e:
+            # Headers are already sent, the stream just ends early
+            logger.error(f"Error streaming S3 metrics: {e}")
+    
+    # Sync generator, Starlette iterates it in a worker thread so S3 reads never block the event loop
+    return StreamingResponse(encoded_metrics(), media_type=media_type)
 
 @router.post("/storage/s3/backup")
-async def create_s3_backup(backup_prefix: Optional[str] = None):
+async def create_s3_backup(
+    backup_prefix: Optional[str] = None,
+    s3: S3StorageService = Depends(get_s3_service)
+):
     """Create a backup of all S3 data"""
     try:
         backup_key = s3.create_backup(backup_prefix)
@@ -130,7 +165,7 @@ async def create_s3_backup(backup_prefix: Optional[str] = None):
                 "status": "success",
                 "message": "Backup created successfully",
                 "backup_prefix": backup_key,
-                "timestamp": datetime.now().isoformat()
+                "timestamp": datetime.now()
             }
         else:
             raise HTTPException(status_code=500, detail="Backup creation failed")
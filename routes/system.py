@@ -22,7 +22,7 @@ async def get_info():
     current_time = datetime.now()
     return {
         "sysplex": simulator.sysplex_name,
-        "timestamp": current_time.isoformat(),
+        "timestamp": current_time,
         "uptime_seconds": int((current_time - simulator.start_time).total_seconds()),
         "lpars": [
             {
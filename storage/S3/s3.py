@@ -1,17 +1,64 @@
 import boto3
+from boto3.s3.transfer import TransferConfig
 from botocore.exceptions import ClientError, NoCredentialsError, EndpointConnectionError
-import json
 import gzip
+import logging
+import orjson
 import pickle
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any, Union
+from typing import Deque, Dict, Iterator, List, Optional, Any, Set, Tuple, Union
 from dataclasses import dataclass, asdict
 import os
+import threading
+import zlib
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from collections import deque
 from contextlib import contextmanager
+from itertools import chain, islice
 import io
 import pandas as pd
 from utils.logger import logger
 
+try:
+    import zstandard
+except ImportError:  # zstandard is optional, objects fall back to gzip
+    zstandard = None
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # pyarrow is optional, batch objects fall back to JSONL
+    pyarrow = None
+
+# Frame magic numbers, used to pick the decompressor of stored objects
+ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+PARQUET_MAGIC = b'PAR1'
+# Object key suffixes per content encoding, for batch objects and per-metric objects
+BATCH_SUFFIXES = {'gzip': '.jsonl.gz', 'zstd': '.jsonl.zst'}
+METRIC_SUFFIXES = {'gzip': '.json.gz', 'zstd': '.json.zst'}
+
+# Raw content zstd dictionary with the field names and values every metric document repeats, it halves
+# the size of a ~200 byte per-metric object. Stored objects can only be read with these exact bytes,
+# never edit them.
+METRIC_ZSTD_DICTIONARY = (
+    b'{"timestamp":"2025-01-01T00:00:00.000000","sysplex":"SYSPLEX01","lpar":"PROD01","cpu_type":"","utilization_percent":0.0,"metric_type":"cpu_utilization"}'
+    b'{"timestamp":"2025-01-01T00:00:00.000000","sysplex":"SYSPLEX01","lpar":"PROD01","memory_type":"","usage_bytes":0.0,"metric_type":"memory_usage"}'
+    b'{"timestamp":"2025-01-01T00:00:00.000000","sysplex":"SYSPLEX01","lpar":"PROD01","device_id":"","utilization_percent":0.0,"metric_type":"ldev_utilization"}'
+    b'{"timestamp":"2025-01-01T00:00:00.000000","sysplex":"SYSPLEX01","lpar":"PROD01","device_type":"","response_time_seconds":0.0,"metric_type":"ldev_response_time"}'
+    b'{"timestamp":"2025-01-01T00:00:00.000000","sysplex":"SYSPLEX01","lpar":"PROD01","cf_link":"","service_time_microseconds":0.0,"metric_type":"clpr_service_time"}'
+    b'{"timestamp":"2025-01-01T00:00:00.000000","sysplex":"SYSPLEX01","lpar":"PROD01","cf_link":"","request_type":"","request_rate":0.0,"metric_type":"clpr_request_rate"}'
+    b'{"timestamp":"2025-01-01T00:00:00.000000","sysplex":"SYSPLEX01","lpar":"PROD01","queue_type":"","processing_rate":0.0,"metric_type":"mpb_processing_rate"}'
+    b'{"timestamp":"2025-01-01T00:00:00.000000","sysplex":"SYSPLEX01","lpar":"PROD01","queue_type":"","queue_depth":0.0,"metric_type":"mpb_queue_depth"}'
+    b'{"timestamp":"2025-01-01T00:00:00.000000","sysplex":"SYSPLEX01","lpar":"PROD01","port_type":"","port_id":"","utilization_percent":0.0,"metric_type":"ports_utilization"}'
+    b'{"timestamp":"2025-01-01T00:00:00.000000","sysplex":"SYSPLEX01","lpar":"PROD01","port_type":"","port_id":"","throughput_mbps":0.0,"metric_type":"ports_throughput"}'
+    b'{"timestamp":"2025-01-01T00:00:00.000000","sysplex":"SYSPLEX01","lpar":"PROD01","volume_type":"","volume_id":"","utilization_percent":0.0,"metric_type":"volumes_utilization"}'
+    b'{"timestamp":"2025-01-01T00:00:00.000000","sysplex":"SYSPLEX01","lpar":"PROD01","volume_type":"","volume_id":"","iops":0.0,"metric_type":"volumes_iops"}'
+)
+# Dictionary framed objects are not plain zstd to HTTP clients, they are tagged with this metadata key instead of
+# a Content-Encoding header, the value identifies the dictionary needed to read them
+METRIC_ZSTD_DICTIONARY_METADATA = 'x-rmf-zstd-dict'
+METRIC_ZSTD_DICTIONARY_ID = f"{zlib.crc32(METRIC_ZSTD_DICTIONARY):08x}"
+
 @dataclass
 class S3Config:
     endpoint_url: str = os.getenv('S3_ENDPOINT_URL', 'http://localhost:9000')
@@ -21,6 +68,22 @@ class S3Config:
     region_name: str = os.getenv('S3_REGION', 'us-east-1')
     use_ssl: bool = os.getenv('S3_USE_SSL', 'false').lower() == 'true'
     signature_version: str = os.getenv('S3_SIGNATURE_VERSION', 's3v4')
+    # Content encoding of stored objects, 'zstd' or 'gzip'
+    compression: str = os.getenv('S3_COMPRESSION', 'zstd').lower()
+    # Layout of batch objects, 'jsonl' (compressed with the content encoding) or 'parquet' (zstd column chunks)
+    batch_format: str = os.getenv('S3_BATCH_FORMAT', 'jsonl').lower()
+    # gzip level when compression is 'gzip', 1 is several times faster than 9 on metric JSON
+    gzip_level: int = int(os.getenv('S3_GZIP_LEVEL', '1'))
+    # Spread per-metric keys over 256 hashed prefixes (metrics/<xx>/<type>/...) so S3 can partition the load
+    key_salt: bool = os.getenv('S3_KEY_SALT', 'false').lower() == 'true'
+    # Concurrent PUT/LIST/GET threads, also the size of the botocore connection pool
+    upload_workers: int = int(os.getenv('S3_UPLOAD_WORKERS', '64'))
+    # Filter gzip objects by time range server side with S3 Select, MinIO support varies by version
+    use_select: bool = os.getenv('S3_USE_SELECT', 'false').lower() == 'true'
+    # Batch objects at least this large are uploaded as concurrent multipart parts of the same size
+    multipart_threshold_mb: int = int(os.getenv('S3_MULTIPART_THRESHOLD_MB', '8'))
+    # Objects downloaded ahead of the consumer when reading metrics back
+    download_window: int = int(os.getenv('S3_DOWNLOAD_WINDOW', '32'))
 
 class S3StorageService:
     def __init__(self, config: S3Config = None):
@@ -28,10 +91,50 @@ class S3StorageService:
         self.s3_client = None
         self.s3_resource = None
         self.bucket = None
+        self.content_encoding = self._resolve_content_encoding()
+        self.batch_format = self._resolve_batch_format()
+        # zstandard (de)compressors are not thread-safe, every thread gets its own set
+        self._zstd_local = threading.local()
+        self._zstd_dictionary = (
+            zstandard.ZstdCompressionDict(METRIC_ZSTD_DICTIONARY, dict_type=zstandard.DICT_TYPE_RAWCONTENT)
+            if zstandard is not None else None
+        )
+        # S3 requests are RTT bound, so PUTs and fanned-out listings run on a pool instead of one after another
+        self._io_executor = ThreadPoolExecutor(
+            max_workers=self.config.upload_workers, thread_name_prefix="s3-io"
+        )
+        self._pending_uploads: Set[Future] = set()
+        multipart_bytes = self.config.multipart_threshold_mb * 1024 * 1024
+        self._transfer_config = TransferConfig(
+            multipart_threshold=multipart_bytes, multipart_chunksize=multipart_bytes, max_concurrency=8
+        )
+        self._pending_lock = threading.Lock()
         self.initialize_storage()
     
-    def _create_s3_clients(self):
-        """Create S3 client and resource"""
+    def _resolve_content_encoding(self) -> str:
+        """Pick the object content encoding, zstd needs the optional zstandard package"""
+        encoding = self.config.compression
+        if encoding not in BATCH_SUFFIXES:
+            logger.warning(f"Unknown S3 compression '{encoding}', using gzip")
+            return 'gzip'
+        if encoding == 'zstd' and zstandard is None:
+            logger.warning("zstandard is not installed, S3 objects are compressed with gzip")
+            return 'gzip'
+        return encoding
+    
+    def _resolve_batch_format(self) -> str:
+        """Pick the batch object layout, parquet needs the optional pyarrow package"""
+        batch_format = self.config.batch_format
+        if batch_format not in ('jsonl', 'parquet'):
+            logger.warning(f"Unknown S3 batch format '{batch_format}', using jsonl")
+            return 'jsonl'
+        if batch_format == 'parquet' and pyarrow is None:
+            logger.warning("pyarrow is not installed, S3 batches are stored as JSONL")
+            return 'jsonl'
+        return batch_format
+    
+    def _create_s3_session_and_clients(self):
+        """Create S3 client and resource, connectivity is first probed by _ensure_bucket_exists"""
         try:
             session = boto3.Session(
                 aws_access_key_id=self.config.access_key,
@@ -44,39 +147,23 @@ class S3StorageService:
                 'use_ssl': self.config.use_ssl,
                 'config': boto3.session.Config(
                     signature_version=self.config.signature_version,
-                    retries={'max_attempts': 3, 'mode': 'adaptive'}
+                    retries={'max_attempts': 3, 'mode': 'adaptive'},
+                    # One pooled connection per upload thread, the default of 10 would serialize them
+                    max_pool_connections=self.config.upload_workers
                 )
             }
             
             self.s3_client = session.client('s3', **client_config)
             self.s3_resource = session.resource('s3', **client_config)
             
-            # Test connection
-            self.s3_client.head_bucket(Bucket=self.config.bucket_name)
-            
-            logger.info(f"Successfully connected to S3-compatible storage: {self.config.endpoint_url}")
-            
-        except ClientError as e:
-            if e.response['Error']['Code'] == '404':
-                # Bucket doesn't exist, but connection is working
-                logger.info(f"Connected to S3-compatible storage: {self.config.endpoint_url}")
-            else:
-                logger.error(f"S3 ClientError: {e}")
-                raise
-        except NoCredentialsError:
-            logger.error("S3 credentials not found or invalid")
-            raise
-        except EndpointConnectionError as e:
-            logger.error(f"Failed to connect to S3 endpoint: {e}")
-            raise
         except Exception as e:
-            logger.error(f"Unexpected error connecting to S3: {e}")
+            logger.error(f"Unexpected error creating S3 clients: {e}")
             raise
     
     def initialize_storage(self):
         """Initialize S3 connection and create bucket if necessary"""
         try:
-            self._create_s3_clients()
+            self._create_s3_session_and_clients()
             self._ensure_bucket_exists()
             self._setup_bucket_lifecycle()
             logger.info("S3 storage initialization completed successfully")
@@ -86,13 +173,22 @@ class S3StorageService:
             raise
     
     def _ensure_bucket_exists(self):
-        """Create bucket if it doesn't exist"""
+        """Create bucket if it doesn't exist, this is also the startup connectivity probe"""
         try:
             self.s3_client.head_bucket(Bucket=self.config.bucket_name)
+            logger.info(f"Successfully connected to S3-compatible storage: {self.config.endpoint_url}")
             logger.info(f"Bucket '{self.config.bucket_name}' already exists")
             
+        except NoCredentialsError:
+            logger.error("S3 credentials not found or invalid")
+            raise
+        except EndpointConnectionError as e:
+            logger.error(f"Failed to connect to S3 endpoint: {e}")
+            raise
         except ClientError as e:
             if e.response['Error']['Code'] == '404':
+                # Bucket doesn't exist, but connection is working
+                logger.info(f"Connected to S3-compatible storage: {self.config.endpoint_url}")
                 # Bucket doesn't exist, create it
                 try:
                     if self.config.region_name == 'us-east-1':
@@ -163,21 +259,241 @@ class S3StorageService:
                            sysplex: str, lpar: str, additional_info: str = "") -> str:
         """Generate S3 object key with proper partitioning"""
         date_part = timestamp.strftime("%Y/%m/%d/%H")
+        suffix = METRIC_SUFFIXES[self.content_encoding]
+        if self.config.key_salt:
+            metric_type = f"{self._key_salt(metric_type, sysplex, lpar)}/{metric_type}"
         
         if additional_info:
-            return f"metrics/{metric_type}/{sysplex}/{lpar}/{date_part}/{additional_info}_{timestamp.strftime('%Y%m%d_%H%M%S')}.json.gz"
+            return f"metrics/{metric_type}/{sysplex}/{lpar}/{date_part}/{additional_info}_{timestamp.strftime('%Y%m%d_%H%M%S')}{suffix}"
         else:
-            return f"metrics/{metric_type}/{sysplex}/{lpar}/{date_part}/{timestamp.strftime('%Y%m%d_%H%M%S')}.json.gz"
+            return f"metrics/{metric_type}/{sysplex}/{lpar}/{date_part}/{timestamp.strftime('%Y%m%d_%H%M%S')}{suffix}"
     
-    def _compress_data(self, data: Union[Dict, List]) -> bytes:
-        """Compress data using gzip"""
-        json_data = json.dumps(data, default=str, ensure_ascii=False)
-        return gzip.compress(json_data.encode('utf-8'))
+    @staticmethod
+    def _key_salt(metric_type: str, sysplex: str, lpar: str) -> str:
+        """Two hex digit prefix derived from the series, stable so readers can recompute it"""
+        return f"{zlib.crc32(f'{sysplex}/{lpar}/{metric_type}'.encode()) & 0xFF:02x}"
+    
+    def _metric_prefixes(self, metric_type: str, sysplex: str = None, lpar: str = None) -> List[str]:
+        """Listing prefixes that can hold objects of the given series"""
+        series = f"{metric_type}/"
+        if sysplex:
+            series += f"{sysplex}/"
+            if lpar:
+                series += f"{lpar}/"
+        # Unsalted keys: per-metric objects written before S3_KEY_SALT was enabled, batch objects live under metrics/batch/
+        prefixes = [f"metrics/{series}"]
+        if self.config.key_salt:
+            if sysplex and lpar:
+                prefixes.append(f"metrics/{self._key_salt(metric_type, sysplex, lpar)}/{series}")
+            else:
+                prefixes.extend(f"metrics/{salt:02x}/{series}" for salt in range(256))
+        return prefixes
+    
+    def _list_object_keys(self, prefix: str, page_size: int) -> Iterator[str]:
+        """Yield the keys under one prefix, page by page"""
+        paginator = self.s3_client.get_paginator('list_objects_v2')
+        for page in paginator.paginate(Bucket=self.config.bucket_name, Prefix=prefix, MaxKeys=page_size):
+            for obj in page.get('Contents', ()):
+                yield obj['Key']
+    
+    def _list_first_page(self, prefix: str, page_size: int) -> Tuple[List[str], Iterator[str]]:
+        """List the first page of keys under one prefix, returns it with the iterator over the remaining pages"""
+        keys = self._list_object_keys(prefix, page_size)
+        return list(islice(keys, page_size)), keys
+    
+    def _iter_object_keys(self, prefixes: List[str], page_size: int, max_keys: Optional[int]) -> Iterator[str]:
+        """Yield the keys under every prefix, at most max_keys per prefix, listing several prefixes concurrently"""
+        if len(prefixes) == 1:
+            yield from islice(self._list_object_keys(prefixes[0], page_size), max_keys)
+            return
+        # Only the first pages of the next download_window prefixes are listed ahead, further pages are requested
+        # when the consumer reaches them, so memory stays bounded and listing stops as soon as the consumer does
+        window = max(self.config.download_window, 1)
+        pending = iter(prefixes)
+        in_flight: Deque[Future] = deque(
+            self._io_executor.submit(self._list_first_page, prefix, page_size) for prefix in islice(pending, window)
+        )
+        try:
+            while in_flight:
+                first_page, remaining_pages = in_flight.popleft().result()
+                for prefix in islice(pending, 1):
+                    in_flight.append(self._io_executor.submit(self._list_first_page, prefix, page_size))
+                yield from islice(chain(first_page, remaining_pages), max_keys)
+        finally:
+            for future in in_flight:
+                future.cancel()
+    
+    def _select_metrics(self, object_key: str, start_time: datetime = None, end_time: datetime = None) -> List[Dict]:
+        """Filter one gzip object by record timestamp inside S3, only the matching records are transferred"""
+        # Stored timestamps are ISO strings, which compare correctly as text
+        conditions = []
+        if start_time:
+            conditions.append(f"s.\"timestamp\" >= '{start_time.isoformat()}'")
+        if end_time:
+            conditions.append(f"s.\"timestamp\" <= '{end_time.isoformat()}'")
+        
+        # Per-metric .json.gz objects hold one document, batch objects written before JSONL hold a top-level array
+        # whose elements are only addressed as S3Object[*]
+        source = 'S3Object[*]' if self._is_array_document(object_key) else 'S3Object'
+        response = self.s3_client.select_object_content(
+            Bucket=self.config.bucket_name,
+            Key=object_key,
+            ExpressionType='SQL',
+            Expression=f"SELECT s.* FROM {source} s WHERE {' AND '.join(conditions)}",
+            InputSerialization={
+                'JSON': {'Type': 'LINES' if object_key.endswith('.jsonl.gz') else 'DOCUMENT'},
+                'CompressionType': 'GZIP'
+            },
+            OutputSerialization={'JSON': {'RecordDelimiter': '\n'}}
+        )
+        json_data = b''.join(
+            event['Records']['Payload'] for event in response['Payload'] if 'Records' in event
+        ).strip()
+        if not json_data:
+            return []
+        return orjson.loads(b'[' + json_data.replace(b'\n', b',') + b']')
+    
+    @staticmethod
+    def _is_array_document(object_key: str) -> bool:
+        """Check if a gzip object is a batch written as one JSON array rather than JSON lines"""
+        return object_key.startswith('metrics/batch/') and object_key.endswith('.json.gz')
+    
+    def _compress_data(self, data: Union[Dict, List], metric_dictionary: bool = False) -> bytes:
+        """Serialize data as one JSON document and compress it with the content encoding"""
+        # orjson emits UTF-8 bytes directly and serializes numpy values as-is
+        json_data = orjson.dumps(
+            data,
+            default=str,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        )
+        if self.content_encoding == 'zstd':
+            # The dictionary only pays off for ~200 byte per-metric documents, anything larger stays a plain frame
+            codecs = self._zstd_codecs()
+            compressor = codecs.metric_compressor if metric_dictionary else codecs.batch_compressor
+            return compressor.compress(json_data)
+        return self._gzip(json_data)
+    
+    def _compress_metric(self, data: Dict) -> bytes:
+        """Compress one per-metric document, zstd frames use the metric dictionary"""
+        return self._compress_data(data, metric_dictionary=True)
+    
+    def _zstd_codecs(self) -> threading.local:
+        """Return this thread's zstd compressors and decompressor, created on first use"""
+        codecs = self._zstd_local
+        if not hasattr(codecs, 'decompressor'):
+            codecs.metric_compressor = zstandard.ZstdCompressor(level=3, dict_data=self._zstd_dictionary)
+            # Batch objects and archives are large enough without the dictionary and stay readable by any zstd tool
+            codecs.batch_compressor = zstandard.ZstdCompressor(level=3)
+            # Frames written without the dictionary never reference it, so one decompressor reads both
+            codecs.decompressor = zstandard.ZstdDecompressor(dict_data=self._zstd_dictionary)
+        return codecs
+    
+    def _gzip(self, data: bytes) -> bytes:
+        """gzip data with a deflate window sized to the payload"""
+        # Allocating the default 32KB window and hash tables costs far more than deflating a ~200 byte metric,
+        # and zlib compressors cannot be reset for reuse, so small payloads get a small window instead
+        window_bits = min(max(len(data).bit_length(), 9), 15)
+        compressor = zlib.compressobj(self.config.gzip_level, zlib.DEFLATED, 16 + window_bits, max(window_bits - 7, 1))
+        return compressor.compress(data) + compressor.flush()
+    
+    def _compress_jsonl(self, rows: List[Any]) -> bytes:
+        """Serialize rows as newline-delimited JSON and compress them with the content encoding"""
+        json_lines = b"\n".join(
+            orjson.dumps(row, default=str, option=orjson.OPT_SERIALIZE_NUMPY) for row in rows
+        )
+        if self.content_encoding == 'zstd':
+            return self._zstd_codecs().batch_compressor.compress(json_lines + b"\n")
+        return self._gzip(json_lines + b"\n")
+    
+    def _compress_parquet(self, batches: List[Any]) -> bytes:
+        """Write MetricBatch objects of one family as a zstd compressed Parquet file, columns as in records()"""
+        columns: Dict[str, List[Any]] = {'timestamp': [], 'sysplex': [], 'lpar': []}
+        for batch in batches:
+            count = len(batch)
+            columns['timestamp'].extend([batch.timestamp] * count)
+            columns['sysplex'].extend([batch.sysplex] * count)
+            columns['lpar'].extend([batch.lpar] * count)
+            for name, values in batch.columns.items():
+                columns.setdefault(name, []).extend(values)
+        columns['metric_type'] = [batch.metric_type for batch in batches for _ in range(len(batch))]
+        
+        # Metric columns keep their inferred types, ISO timestamp strings become real timestamps
+        arrays = {name: pyarrow.array(values) for name, values in columns.items()}
+        arrays['timestamp'] = arrays['timestamp'].cast(pyarrow.timestamp('us'))
+        buffer = io.BytesIO()
+        pyarrow.parquet.write_table(pyarrow.table(arrays), buffer, compression='zstd', use_dictionary=True)
+        return buffer.getvalue()
     
     def _decompress_data(self, compressed_data: bytes) -> Union[Dict, List]:
-        """Decompress gzipped data"""
-        json_data = gzip.decompress(compressed_data).decode('utf-8')
-        return json.loads(json_data)
+        """Decompress gzip or zstd data, JSON documents and newline-delimited JSON are both accepted, as is Parquet"""
+        if compressed_data.startswith(PARQUET_MAGIC):
+            if pyarrow is None:
+                raise RuntimeError("pyarrow is required to read Parquet objects")
+            return pyarrow.parquet.read_table(io.BytesIO(compressed_data)).to_pylist()
+        if compressed_data.startswith(ZSTD_MAGIC):
+            if zstandard is None:
+                raise RuntimeError("zstandard is required to read zstd compressed objects")
+            json_data = self._zstd_codecs().decompressor.decompress(compressed_data)
+        else:
+            json_data = gzip.decompress(compressed_data)
+        # orjson parses the UTF-8 bytes directly, no intermediate str
+        json_data = json_data.strip()
+        if b'\n' in json_data:
+            # JSON never contains raw newlines inside values, so the lines join into one array parsed in a single call
+            return orjson.loads(b'[' + json_data.replace(b'\n', b',') + b']')
+        return orjson.loads(json_data)
+    
+    def _submit_io(self, fn, *args, **kwargs) -> Future:
+        """Run fn on the I/O pool, or inline once the interpreter is shutting down and the pool refuses work"""
+        try:
+            return self._io_executor.submit(fn, *args, **kwargs)
+        except RuntimeError:
+            # Flushes from atexit handlers still have to reach S3
+            future = Future()
+            try:
+                future.set_result(fn(*args, **kwargs))
+            except Exception as e:
+                future.set_exception(e)
+            return future
+    
+    def _put_metric(self, object_key: str, body: bytes, metadata: Dict[str, str]) -> Future:
+        """Queue the upload of one compressed JSON metric object, returns the PUT future"""
+        if self.content_encoding == 'zstd':
+            # Clients honouring Content-Encoding: zstd would fail on a dictionary frame, so only the metadata names it
+            content = {'ContentType': 'application/octet-stream'}
+            metadata[METRIC_ZSTD_DICTIONARY_METADATA] = METRIC_ZSTD_DICTIONARY_ID
+        else:
+            content = {'ContentType': 'application/json', 'ContentEncoding': self.content_encoding}
+        future = self._submit_io(
+            self.s3_client.put_object,
+            Bucket=self.config.bucket_name,
+            Key=object_key,
+            Body=body,
+            Metadata=metadata,
+            **content
+        )
+        with self._pending_lock:
+            self._pending_uploads.add(future)
+        future.add_done_callback(self._upload_done)
+        return future
+    
+    def _upload_done(self, future: Future):
+        """Forget a finished upload and log its failure, nobody else may look at the future"""
+        with self._pending_lock:
+            self._pending_uploads.discard(future)
+        if not future.cancelled() and future.exception() is not None:
+            logger.error(f"Error uploading metric to S3: {future.exception()}")
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait for queued metric uploads, returns False if some are still pending after timeout"""
+        with self._pending_lock:
+            pending = list(self._pending_uploads)
+        if not pending:
+            return True
+        _, not_done = wait(pending, timeout=timeout)
+        if not_done:
+            logger.warning(f"{len(not_done)} S3 uploads still pending after {timeout}s")
+        return not not_done
     
     def store_cpu_metric(self, timestamp: datetime, sysplex: str, lpar: str, 
                         cpu_type: str, utilization_percent: float):
@@ -193,23 +509,17 @@ class S3StorageService:
             }
             
             object_key = self._generate_object_key('cpu', timestamp, sysplex, lpar, cpu_type)
-            compressed_data = self._compress_data(data)
+            compressed_data = self._compress_metric(data)
             
-            self.s3_client.put_object(
-                Bucket=self.config.bucket_name,
-                Key=object_key,
-                Body=compressed_data,
-                ContentType='application/json',
-                ContentEncoding='gzip',
-                Metadata={
-                    'metric-type': 'cpu_utilization',
-                    'sysplex': sysplex,
-                    'lpar': lpar,
-                    'cpu-type': cpu_type
-                }
-            )
+            upload = self._put_metric(object_key, compressed_data, {
+                'metric-type': 'cpu_utilization',
+                'sysplex': sysplex,
+                'lpar': lpar,
+                'cpu-type': cpu_type
+            })
             
-            logger.debug(f"Stored CPU metric: {object_key}")
+            logger.debug(f"Queued CPU metric upload: {object_key}")
+            return upload
             
         except Exception as e:
             logger.error(f"Error storing CPU metric to S3: {e}")
@@ -229,23 +539,17 @@ class S3StorageService:
             }
             
             object_key = self._generate_object_key('memory', timestamp, sysplex, lpar, memory_type)
-            compressed_data = self._compress_data(data)
+            compressed_data = self._compress_metric(data)
             
-            self.s3_client.put_object(
-                Bucket=self.config.bucket_name,
-                Key=object_key,
-                Body=compressed_data,
-                ContentType='application/json',
-                ContentEncoding='gzip',
-                Metadata={
-                    'metric-type': 'memory_usage',
-                    'sysplex': sysplex,
-                    'lpar': lpar,
-                    'memory-type': memory_type
-                }
-            )
+            upload = self._put_metric(object_key, compressed_data, {
+                'metric-type': 'memory_usage',
+                'sysplex': sysplex,
+                'lpar': lpar,
+                'memory-type': memory_type
+            })
             
-            logger.debug(f"Stored memory metric: {object_key}")
+            logger.debug(f"Queued memory metric upload: {object_key}")
+            return upload
             
         except Exception as e:
             logger.error(f"Error storing memory metric to S3: {e}")
@@ -265,21 +569,15 @@ class S3StorageService:
             }
             
             object_key = self._generate_object_key('ldev_utilization', timestamp, sysplex, lpar, device_id)
-            compressed_data = self._compress_data(data)
+            compressed_data = self._compress_metric(data)
             
-            self.s3_client.put_object(
-                Bucket=self.config.bucket_name,
-                Key=object_key,
-                Body=compressed_data,
-                ContentType='application/json',
-                ContentEncoding='gzip',
-                Metadata={
-                    'metric-type': 'ldev_utilization',
-                    'sysplex': sysplex,
-                    'lpar': lpar,
-                    'device-id': device_id
-                }
-            )
+            upload = self._put_metric(object_key, compressed_data, {
+                'metric-type': 'ldev_utilization',
+                'sysplex': sysplex,
+                'lpar': lpar,
+                'device-id': device_id
+            })
+            return upload
             
         except Exception as e:
             logger.error(f"Error storing LDEV utilization metric to S3: {e}")
@@ -299,21 +597,15 @@ class S3StorageService:
             }
             
             object_key = self._generate_object_key('ldev_response_time', timestamp, sysplex, lpar, device_type)
-            compressed_data = self._compress_data(data)
+            compressed_data = self._compress_metric(data)
             
-            self.s3_client.put_object(
-                Bucket=self.config.bucket_name,
-                Key=object_key,
-                Body=compressed_data,
-                ContentType='application/json',
-                ContentEncoding='gzip',
-                Metadata={
-                    'metric-type': 'ldev_response_time',
-                    'sysplex': sysplex,
-                    'lpar': lpar,
-                    'device-type': device_type
-                }
-            )
+            upload = self._put_metric(object_key, compressed_data, {
+                'metric-type': 'ldev_response_time',
+                'sysplex': sysplex,
+                'lpar': lpar,
+                'device-type': device_type
+            })
+            return upload
             
         except Exception as e:
             logger.error(f"Error storing LDEV response time metric to S3: {e}")
@@ -333,21 +625,15 @@ class S3StorageService:
             }
             
             object_key = self._generate_object_key('clpr_service_time', timestamp, sysplex, lpar, cf_link)
-            compressed_data = self._compress_data(data)
+            compressed_data = self._compress_metric(data)
             
-            self.s3_client.put_object(
-                Bucket=self.config.bucket_name,
-                Key=object_key,
-                Body=compressed_data,
-                ContentType='application/json',
-                ContentEncoding='gzip',
-                Metadata={
-                    'metric-type': 'clpr_service_time',
-                    'sysplex': sysplex,
-                    'lpar': lpar,
-                    'cf-link': cf_link
-                }
-            )
+            upload = self._put_metric(object_key, compressed_data, {
+                'metric-type': 'clpr_service_time',
+                'sysplex': sysplex,
+                'lpar': lpar,
+                'cf-link': cf_link
+            })
+            return upload
             
         except Exception as e:
             logger.error(f"Error storing CLPR service time metric to S3: {e}")
@@ -368,22 +654,16 @@ class S3StorageService:
             }
             
             object_key = self._generate_object_key('clpr_request_rate', timestamp, sysplex, lpar, f"{cf_link}_{request_type}")
-            compressed_data = self._compress_data(data)
+            compressed_data = self._compress_metric(data)
             
-            self.s3_client.put_object(
-                Bucket=self.config.bucket_name,
-                Key=object_key,
-                Body=compressed_data,
-                ContentType='application/json',
-                ContentEncoding='gzip',
-                Metadata={
-                    'metric-type': 'clpr_request_rate',
-                    'sysplex': sysplex,
-                    'lpar': lpar,
-                    'cf-link': cf_link,
-                    'request-type': request_type
-                }
-            )
+            upload = self._put_metric(object_key, compressed_data, {
+                'metric-type': 'clpr_request_rate',
+                'sysplex': sysplex,
+                'lpar': lpar,
+                'cf-link': cf_link,
+                'request-type': request_type
+            })
+            return upload
             
         except Exception as e:
             logger.error(f"Error storing CLPR request rate metric to S3: {e}")
@@ -403,21 +683,15 @@ class S3StorageService:
             }
             
             object_key = self._generate_object_key('mpb_processing_rate', timestamp, sysplex, lpar, queue_type)
-            compressed_data = self._compress_data(data)
+            compressed_data = self._compress_metric(data)
             
-            self.s3_client.put_object(
-                Bucket=self.config.bucket_name,
-                Key=object_key,
-                Body=compressed_data,
-                ContentType='application/json',
-                ContentEncoding='gzip',
-                Metadata={
-                    'metric-type': 'mpb_processing_rate',
-                    'sysplex': sysplex,
-                    'lpar': lpar,
-                    'queue-type': queue_type
-                }
-            )
+            upload = self._put_metric(object_key, compressed_data, {
+                'metric-type': 'mpb_processing_rate',
+                'sysplex': sysplex,
+                'lpar': lpar,
+                'queue-type': queue_type
+            })
+            return upload
             
         except Exception as e:
             logger.error(f"Error storing MPB processing rate metric to S3: {e}")
@@ -437,21 +711,15 @@ class S3StorageService:
             }
             
             object_key = self._generate_object_key('mpb_queue_depth', timestamp, sysplex, lpar, queue_type)
-            compressed_data = self._compress_data(data)
+            compressed_data = self._compress_metric(data)
             
-            self.s3_client.put_object(
-                Bucket=self.config.bucket_name,
-                Key=object_key,
-                Body=compressed_data,
-                ContentType='application/json',
-                ContentEncoding='gzip',
-                Metadata={
-                    'metric-type': 'mpb_queue_depth',
-                    'sysplex': sysplex,
-                    'lpar': lpar,
-                    'queue-type': queue_type
-                }
-            )
+            upload = self._put_metric(object_key, compressed_data, {
+                'metric-type': 'mpb_queue_depth',
+                'sysplex': sysplex,
+                'lpar': lpar,
+                'queue-type': queue_type
+            })
+            return upload
             
         except Exception as e:
             logger.error(f"Error storing MPB queue depth metric to S3: {e}")
@@ -472,22 +740,16 @@ class S3StorageService:
             }
             
             object_key = self._generate_object_key('ports_utilization', timestamp, sysplex, lpar, f"{port_type}_{port_id}")
-            compressed_data = self._compress_data(data)
+            compressed_data = self._compress_metric(data)
             
-            self.s3_client.put_object(
-                Bucket=self.config.bucket_name,
-                Key=object_key,
-                Body=compressed_data,
-                ContentType='application/json',
-                ContentEncoding='gzip',
-                Metadata={
-                    'metric-type': 'ports_utilization',
-                    'sysplex': sysplex,
-                    'lpar': lpar,
-                    'port-type': port_type,
-                    'port-id': port_id
-                }
-            )
+            upload = self._put_metric(object_key, compressed_data, {
+                'metric-type': 'ports_utilization',
+                'sysplex': sysplex,
+                'lpar': lpar,
+                'port-type': port_type,
+                'port-id': port_id
+            })
+            return upload
             
         except Exception as e:
             logger.error(f"Error storing ports utilization metric to S3: {e}")
@@ -508,22 +770,16 @@ class S3StorageService:
             }
             
             object_key = self._generate_object_key('ports_throughput', timestamp, sysplex, lpar, f"{port_type}_{port_id}")
-            compressed_data = self._compress_data(data)
+            compressed_data = self._compress_metric(data)
             
-            self.s3_client.put_object(
-                Bucket=self.config.bucket_name,
-                Key=object_key,
-                Body=compressed_data,
-                ContentType='application/json',
-                ContentEncoding='gzip',
-                Metadata={
-                    'metric-type': 'ports_throughput',
-                    'sysplex': sysplex,
-                    'lpar': lpar,
-                    'port-type': port_type,
-                    'port-id': port_id
-                }
-            )
+            upload = self._put_metric(object_key, compressed_data, {
+                'metric-type': 'ports_throughput',
+                'sysplex': sysplex,
+                'lpar': lpar,
+                'port-type': port_type,
+                'port-id': port_id
+            })
+            return upload
             
         except Exception as e:
             logger.error(f"Error storing ports throughput metric to S3: {e}")
@@ -544,22 +800,16 @@ class S3StorageService:
             }
             
             object_key = self._generate_object_key('volumes_utilization', timestamp, sysplex, lpar, f"{volume_type}_{volume_id}")
-            compressed_data = self._compress_data(data)
+            compressed_data = self._compress_metric(data)
             
-            self.s3_client.put_object(
-                Bucket=self.config.bucket_name,
-                Key=object_key,
-                Body=compressed_data,
-                ContentType='application/json',
-                ContentEncoding='gzip',
-                Metadata={
-                    'metric-type': 'volumes_utilization',
-                    'sysplex': sysplex,
-                    'lpar': lpar,
-                    'volume-type': volume_type,
-                    'volume-id': volume_id
-                }
-            )
+            upload = self._put_metric(object_key, compressed_data, {
+                'metric-type': 'volumes_utilization',
+                'sysplex': sysplex,
+                'lpar': lpar,
+                'volume-type': volume_type,
+                'volume-id': volume_id
+            })
+            return upload
             
         except Exception as e:
             logger.error(f"Error storing volumes utilization metric to S3: {e}")
@@ -580,142 +830,180 @@ class S3StorageService:
             }
             
             object_key = self._generate_object_key('volumes_iops', timestamp, sysplex, lpar, f"{volume_type}_{volume_id}")
-            compressed_data = self._compress_data(data)
+            compressed_data = self._compress_metric(data)
             
-            self.s3_client.put_object(
-                Bucket=self.config.bucket_name,
-                Key=object_key,
-                Body=compressed_data,
-                ContentType='application/json',
-                ContentEncoding='gzip',
-                Metadata={
-                    'metric-type': 'volumes_iops',
-                    'sysplex': sysplex,
-                    'lpar': lpar,
-                    'volume-type': volume_type,
-                    'volume-id': volume_id
-                }
-            )
+            upload = self._put_metric(object_key, compressed_data, {
+                'metric-type': 'volumes_iops',
+                'sysplex': sysplex,
+                'lpar': lpar,
+                'volume-type': volume_type,
+                'volume-id': volume_id
+            })
+            return upload
             
         except Exception as e:
             logger.error(f"Error storing volumes IOPS metric to S3: {e}")
             raise
     
-    def batch_store_metrics(self, metrics_batch: List[Dict[str, Any]]):
-        """Store multiple metrics in a single batch operation"""
+    def batch_store_metrics(self, metrics_batch: List[Any]):
+        """Store multiple metric batches (models.metrics.MetricBatch) in a single batch operation"""
         try:
             batch_timestamp = datetime.now()
             batch_id = batch_timestamp.strftime('%Y%m%d_%H%M%S_%f')
             
-            # Group metrics by type and LPAR for efficient storage
+            # Group batches by type, every LPAR of a family goes into the same object
             grouped_metrics = {}
-            for metric in metrics_batch:
-                key = f"{metric['metric_type']}_{metric['sysplex']}_{metric['lpar']}"
+            for batch in metrics_batch:
+                key = (batch.metric_type, batch.sysplex)
                 if key not in grouped_metrics:
                     grouped_metrics[key] = []
-                grouped_metrics[key].append(metric)
+                grouped_metrics[key].append(batch)
             
-            # Store each group as a separate object
-            for group_key, group_metrics in grouped_metrics.items():
-                metric_type, sysplex, lpar = group_key.split('_', 2)
+            # Store each group as one object, one PUT per family, all PUTs in flight at once
+            uploads = []
+            for (metric_type, sysplex), group_batches in grouped_metrics.items():
                 
-                object_key = f"metrics/batch/{metric_type}/{sysplex}/{lpar}/{batch_timestamp.strftime('%Y/%m/%d/%H')}/batch_{batch_id}.json.gz"
-                compressed_data = self._compress_data(group_metrics)
+                key_prefix = f"metrics/batch/{metric_type}/{sysplex}/{batch_timestamp.strftime('%Y/%m/%d/%H')}/batch_{batch_id}"
+                metrics_count = sum(len(batch) for batch in group_batches)
+                if self.batch_format == 'parquet':
+                    # Columnar batches go straight into Arrow arrays, no per-record dicts
+                    object_key = f"{key_prefix}.parquet"
+                    body = self._compress_parquet(group_batches)
+                    content = {'ContentType': 'application/vnd.apache.parquet'}
+                else:
+                    object_key = f"{key_prefix}{BATCH_SUFFIXES[self.content_encoding]}"
+                    # Batches are expanded to one record per sample, the object layout is unchanged
+                    group_metrics = [record for batch in group_batches for record in batch.records()]
+                    body = self._compress_jsonl(group_metrics)
+                    content = {'ContentType': 'application/x-ndjson', 'ContentEncoding': self.content_encoding}
                 
-                self.s3_client.put_object(
-                    Bucket=self.config.bucket_name,
-                    Key=object_key,
-                    Body=compressed_data,
-                    ContentType='application/json',
-                    ContentEncoding='gzip',
+                upload = self._submit_io(
+                    self._upload_object,
+                    object_key,
+                    body,
                     Metadata={
                         'batch-id': batch_id,
                         'metric-type': metric_type,
                         'sysplex': sysplex,
-                        'lpar': lpar,
-                        'metrics-count': str(len(group_metrics))
-                    }
+                        'lpars': ','.join(sorted({batch.lpar for batch in group_batches})),
+                        'metrics-count': str(metrics_count)
+                    },
+                    **content
                 )
-                
-                logger.debug(f"Stored batch of {len(group_metrics)} metrics: {object_key}")
+                uploads.append((object_key, metrics_count, upload))
+            
+            # Wait for every PUT before reporting, the first failure is raised to the caller
+            wait([upload for _, _, upload in uploads])
+            for object_key, metrics_count, upload in uploads:
+                upload.result()
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"Stored batch of {metrics_count} metrics: {object_key}")
             
         except Exception as e:
             logger.error(f"Error storing metrics batch to S3: {e}")
             raise
     
+    def _upload_object(self, object_key: str, body: bytes, **extra_args):
+        """PUT one object, bodies above the multipart threshold are uploaded as concurrent parts"""
+        if len(body) < self._transfer_config.multipart_threshold:
+            self.s3_client.put_object(Bucket=self.config.bucket_name, Key=object_key, Body=body, **extra_args)
+            return
+        self.s3_client.upload_fileobj(
+            io.BytesIO(body), self.config.bucket_name, object_key,
+            ExtraArgs=extra_args, Config=self._transfer_config
+        )
+    
     def retrieve_metrics(self, metric_type: str, sysplex: str = None, lpar: str = None,
                         start_time: datetime = None, end_time: datetime = None,
                         limit: int = 1000) -> List[Dict]:
         """Retrieve metrics from S3 based on filters"""
         try:
-            # Build prefix for S3 listing
-            prefix = f"metrics/{metric_type}/"
-            if sysplex:
-                prefix += f"{sysplex}/"
-                if lpar:
-                    prefix += f"{lpar}/"
-            
-            # List objects
-            paginator = self.s3_client.get_paginator('list_objects_v2')
-            page_iterator = paginator.paginate(
+            return list(self.iter_metrics(metric_type, sysplex, lpar, start_time, end_time, limit))
+        except Exception as e:
+            logger.error(f"Error retrieving metrics from S3: {e}")
+            return []
+    
+    def iter_metrics(self, metric_type: str, sysplex: str = None, lpar: str = None,
+                     start_time: datetime = None, end_time: datetime = None,
+                     limit: int = 1000) -> Iterator[Dict]:
+        """Yield metrics from S3 based on filters, one object is held in memory at a time"""
+        prefixes = self._metric_prefixes(metric_type, sysplex, lpar)
+        # Every object holds at least one metric, so without a time filter no prefix needs more than limit keys,
+        # with one the keys are listed page by page until limit metrics matched
+        max_keys = None if (start_time or end_time) else limit
+        
+        object_keys = (
+            object_key for object_key in self._iter_object_keys(prefixes, limit, max_keys)
+            if self._key_in_time_range(object_key, start_time, end_time)
+        )
+        
+        remaining = limit
+        for metric_data in self._iter_fetched(object_keys, limit, start_time, end_time):
+            for metric in metric_data[:remaining]:
+                yield metric
+            remaining -= min(len(metric_data), remaining)
+            if remaining <= 0:
+                return
+    
+    def _key_in_time_range(self, object_key: str, start_time: Optional[datetime], end_time: Optional[datetime]) -> bool:
+        """Check if object falls within time range, keys without a parsable timestamp always match"""
+        if not (start_time or end_time):
+            return True
+        obj_timestamp = self._extract_timestamp_from_key(object_key)
+        if obj_timestamp:
+            if start_time and obj_timestamp < start_time:
+                return False
+            if end_time and obj_timestamp > end_time:
+                return False
+        return True
+    
+    def _iter_fetched(self, object_keys: Iterator[str], limit: int,
+                      start_time: datetime = None, end_time: datetime = None) -> Iterator[List[Dict]]:
+        """Yield the metrics of each object in key order, keeping up to download_window GETs in flight"""
+        # Every object holds at least one metric, reading further ahead than limit objects is wasted
+        window = max(min(self.config.download_window, limit), 1)
+        in_flight: Deque[Future] = deque()
+        try:
+            for object_key in object_keys:
+                in_flight.append(self._io_executor.submit(self._fetch_metrics, object_key, start_time, end_time))
+                if len(in_flight) >= window:
+                    yield in_flight.popleft().result()
+            while in_flight:
+                yield in_flight.popleft().result()
+        finally:
+            # The consumer stopped early (limit reached, client gone), drop the reads that have not started
+            for future in in_flight:
+                future.cancel()
+    
+    def _fetch_metrics(self, object_key: str, start_time: datetime = None, end_time: datetime = None) -> List[Dict]:
+        """Retrieve and decompress one object, an unreadable object yields no metrics"""
+        # S3 Select only reads gzip (or bzip2) input, zstd objects are always downloaded whole
+        if self.config.use_select and (start_time or end_time) and object_key.endswith(('.json.gz', '.jsonl.gz')):
+            try:
+                # No rows means no record of the object is in range, a GET would only return the out-of-range ones
+                return self._select_metrics(object_key, start_time, end_time)
+            except Exception as e:
+                logger.warning(f"S3 Select failed for {object_key}, downloading it instead: {e}")
+        try:
+            response = self.s3_client.get_object(
                 Bucket=self.config.bucket_name,
-                Prefix=prefix,
-                MaxKeys=limit
+                Key=object_key
             )
-            
-            metrics = []
-            for page in page_iterator:
-                if 'Contents' not in page:
-                    continue
-                
-                for obj in page['Contents']:
-                    # Check if object falls within time range
-                    if start_time or end_time:
-                        obj_timestamp = self._extract_timestamp_from_key(obj['Key'])
-                        if obj_timestamp:
-                            if start_time and obj_timestamp < start_time:
-                                continue
-                            if end_time and obj_timestamp > end_time:
-                                continue
-                    
-                    # Retrieve and decompress object
-                    try:
-                        response = self.s3_client.get_object(
-                            Bucket=self.config.bucket_name,
-                            Key=obj['Key']
-                        )
-                        
-                        compressed_data = response['Body'].read()
-                        metric_data = self._decompress_data(compressed_data)
-                        
-                        if isinstance(metric_data, list):
-                            metrics.extend(metric_data)
-                        else:
-                            metrics.append(metric_data)
-                            
-                        if len(metrics) >= limit:
-                            break
-                            
-                    except Exception as e:
-                        logger.error(f"Error retrieving object {obj['Key']}: {e}")
-                        continue
-                
-                if len(metrics) >= limit:
-                    break
-            
-            return metrics[:limit]
-            
+            metric_data = self._decompress_data(response['Body'].read())
         except Exception as e:
-            logger.error(f"Error retrieving metrics from S3: {e}")
+            logger.error(f"Error retrieving object {object_key}: {e}")
             return []
+        return metric_data if isinstance(metric_data, list) else [metric_data]
     
     def _extract_timestamp_from_key(self, object_key: str) -> Optional[datetime]:
         """Extract timestamp from S3 object key"""
         try:
-            # Extract timestamp from key pattern: .../YYYYMMDD_HHMMSS.json.gz
+            # Extract timestamp from key pattern: .../YYYYMMDD_HHMMSS.json.zst
             parts = object_key.split('/')
             if len(parts) >= 1:
-                filename = parts[-1].replace('.json.gz', '')
+                filename = parts[-1]
+                for suffix in ('.jsonl.zst', '.jsonl.gz', '.json.zst', '.json.gz', '.parquet'):
+                    filename = filename.replace(suffix, '')
                 if '_' in filename:
                     timestamp_str = filename.split('_')[-2] + '_' + filename.split('_')[-1]
                     return datetime.strptime(timestamp_str, '%Y%m%d_%H%M%S')
@@ -804,7 +1092,7 @@ class S3StorageService:
                 return None
             
             # Create archive object
-            archive_key = f"archive/{archive_id}.json.gz"
+            archive_key = f"archive/{archive_id}{METRIC_SUFFIXES[self.content_encoding]}"
             compressed_data = self._compress_data(archive_data)
             
             self.s3_client.put_object(
@@ -812,7 +1100,7 @@ class S3StorageService:
                 Key=archive_key,
                 Body=compressed_data,
                 ContentType='application/json',
-                ContentEncoding='gzip',
+                ContentEncoding=self.content_encoding,
                 StorageClass='GLACIER',  # Use cheaper storage for archives
                 Metadata={
                     'archive-id': archive_id,
@@ -1036,6 +1324,10 @@ class S3StorageService:
     def close_connection(self):
         """Close S3 connections (cleanup)"""
         try:
+            # Let queued uploads finish before the client goes away
+            self.flush()
+            self._io_executor.shutdown(wait=True)
+            
             # boto3 clients are thread-safe and manage connections automatically
             # No explicit cleanup needed, but we can reset references
             self.s3_client = None
@@ -18,8 +18,15 @@ class MongoConfig:
     replica_set: Optional[str] = os.getenv('MONGO_REPLICA_SET', None)
     connection_timeout: int = int(os.getenv('MONGO_CONNECTION_TIMEOUT', '5000'))
     server_selection_timeout: int = int(os.getenv('MONGO_SERVER_SELECTION_TIMEOUT', '5000'))
-    max_pool_size: int = int(os.getenv('MONGO_MAX_POOL_SIZE', '50'))
-    min_pool_size: int = int(os.getenv('MONGO_MIN_POOL_SIZE', '5'))
+    # Metric writes come from the storage I/O pool (4 workers), a small warm pool covers them and the API
+    max_pool_size: int = int(os.getenv('MONGO_MAX_POOL_SIZE', '8'))
+    min_pool_size: int = int(os.getenv('MONGO_MIN_POOL_SIZE', '4'))
+    # Wire compression, zstd/snappy need the zstandard/python-snappy packages, zlib is always available
+    compressors: str = os.getenv('MONGO_COMPRESSORS', 'zlib')
+    # Write concern for bulk metric inserts, 0 = fire-and-forget telemetry writes
+    metrics_write_concern: int = int(os.getenv('MONGO_METRICS_WRITE_CONCERN', '0'))
+    # Upsert metric documents on their natural key so a repeated tick never duplicates rows
+    metrics_upsert: bool = os.getenv('MONGO_METRICS_UPSERT', 'true').lower() == 'true'
     
     def get_connection_string(self) -> str:
         """Build MongoDB connection string"""
@@ -31,6 +31,7 @@ class MongoConnectionManager:
                 serverSelectionTimeoutMS=self.config.server_selection_timeout,
                 maxPoolSize=self.config.max_pool_size,
                 minPoolSize=self.config.min_pool_size,
+                compressors=self.config.compressors,
                 retryWrites=True,
                 retryReads=True
             )
@@ -1,10 +1,16 @@
 """
 MongoDB CRUD Operations
 """
+import logging
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Union
+
+from pymongo import InsertOne, UpdateOne
+from pymongo.collection import Collection
+from pymongo.write_concern import WriteConcern
 
 from utils.logger import logger
+from .schema import METRIC_KEYS
 
 
 class MongoOperations:
@@ -12,6 +18,18 @@ class MongoOperations:
     
     def __init__(self, connection_manager):
         self.connection_manager = connection_manager
+        self.bulk_write_concern = WriteConcern(w=connection_manager.config.metrics_write_concern)
+        self._bulk_collections: Dict[str, Collection] = {}
+        self._client_bulk_write: Optional[bool] = None
+        self.metrics_upsert = connection_manager.config.metrics_upsert
+    
+    def _get_bulk_collection(self, db, collection_name: str) -> Collection:
+        """Get a cached collection handle that uses the bulk metrics write concern"""
+        collection = self._bulk_collections.get(collection_name)
+        if collection is None:
+            collection = db.get_collection(collection_name, write_concern=self.bulk_write_concern)
+            self._bulk_collections[collection_name] = collection
+        return collection
     
     # Individual metric insertion methods
     def insert_cpu_metric(self, timestamp: datetime, sysplex: str, lpar: str, 
@@ -240,7 +258,7 @@ class MongoOperations:
         """Bulk insert multiple documents for better performance"""
         try:
             with self.connection_manager.get_database() as db:
-                collection = db[collection_name]
+                collection = self._get_bulk_collection(db, collection_name)
                 result = collection.insert_many(documents, ordered=False)
                 logger.debug(f"Bulk inserted {len(result.inserted_ids)} documents to {collection_name}")
                 return result.inserted_ids
@@ -249,6 +267,72 @@ class MongoOperations:
             logger.error(f"Error bulk inserting to {collection_name}: {e}")
             return []
     
+    def _supports_client_bulk_write(self, db) -> bool:
+        """Client-level bulkWrite across collections needs MongoDB 8.0+ and a recent driver"""
+        if self._client_bulk_write is None:
+            try:
+                self._client_bulk_write = (
+                    hasattr(db.client, 'bulk_write') and
+                    db.client.server_info().get('versionArray', [0])[0] >= 8
+                )
+            except Exception as e:
+                logger.warning(f"Could not detect MongoDB server version: {e}")
+                self._client_bulk_write = False
+        return self._client_bulk_write
+    
+    def _metric_write_models(self, namespace: str, collection_name: str,
+                             documents: List[Dict]) -> List[Union[InsertOne, UpdateOne]]:
+        """Build upserts keyed on the natural metric key, or plain inserts for collections without one"""
+        key_fields = METRIC_KEYS.get(collection_name) if self.metrics_upsert else None
+        if not key_fields:
+            return [InsertOne(document, namespace=namespace) for document in documents]
+        
+        key_fields = ('timestamp', 'sysplex', 'lpar') + key_fields
+        return [
+            UpdateOne(
+                {field: document[field] for field in key_fields},
+                {'$set': document},
+                upsert=True,
+                namespace=namespace
+            )
+            for document in documents
+        ]
+    
+    def bulk_write_metric_families(self, families: Dict[str, List[Dict]]) -> int:
+        """Write documents for several collections, in one bulkWrite command when supported"""
+        try:
+            with self.connection_manager.get_database() as db:
+                models = {
+                    collection_name: self._metric_write_models(f"{db.name}.{collection_name}", collection_name, documents)
+                    for collection_name, documents in families.items()
+                    if documents
+                }
+                
+                if self._supports_client_bulk_write(db):
+                    all_models = [model for collection_models in models.values() for model in collection_models]
+                    if all_models:
+                        db.client.bulk_write(all_models, ordered=False, write_concern=self.bulk_write_concern)
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug(f"Bulk wrote {len(all_models)} documents to {len(models)} collections")
+                    return len(all_models)
+                
+                # Older servers: one bulk_write per collection
+                written = 0
+                for collection_name, collection_models in models.items():
+                    try:
+                        collection = self._get_bulk_collection(db, collection_name)
+                        collection.bulk_write(collection_models, ordered=False)
+                        written += len(collection_models)
+                    except Exception as e:
+                        logger.error(f"Error bulk writing to {collection_name}: {e}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"Bulk wrote {written} documents to {len(models)} collections")
+                return written
+                
+        except Exception as e:
+            logger.error(f"Error bulk writing to {len(families)} collections: {e}")
+            return 0
+    
     # Data cleanup
     def cleanup_old_data(self, days_to_keep: int = 90):
         """Clean up old data beyond retention period"""
@@ -7,6 +7,23 @@ from pymongo.errors import DuplicateKeyError
 from utils.logger import logger
 
 
+# Fields identifying one sample within a tick, besides timestamp, sysplex and lpar.
+# ldev_response_time_metrics holds one sample per device under its device_type, so it has no natural key.
+METRIC_KEYS = {
+    'cpu_metrics': ('cpu_type',),
+    'memory_metrics': ('memory_type',),
+    'ldev_utilization_metrics': ('device_id',),
+    'clpr_service_time_metrics': ('cf_link',),
+    'clpr_request_rate_metrics': ('cf_link', 'request_type'),
+    'mpb_processing_rate_metrics': ('queue_type',),
+    'mpb_queue_depth_metrics': ('queue_type',),
+    'ports_utilization_metrics': ('port_type', 'port_id'),
+    'ports_throughput_metrics': ('port_type', 'port_id'),
+    'volumes_utilization_metrics': ('volume_type', 'volume_id'),
+    'volumes_iops_metrics': ('volume_type', 'volume_id'),
+}
+
+
 class MongoSchemaManager:
     """Manages MongoDB collections, indexes, and schema setup"""
     
@@ -146,8 +163,15 @@ class MongoSchemaManager:
                 for collection_name, config in self.collections_config.items():
                     collection = database[collection_name]
                     
-                    # Create indexes
-                    for index_spec in config['indexes']:
+                    # Create indexes, plus the natural key index used by metric upserts
+                    index_specs = list(config['indexes'])
+                    if collection_name in METRIC_KEYS:
+                        index_specs.append(
+                            [('lpar', pymongo.ASCENDING)] +
+                            [(field, pymongo.ASCENDING) for field in METRIC_KEYS[collection_name]] +
+                            [('timestamp', pymongo.ASCENDING), ('sysplex', pymongo.ASCENDING)]
+                        )
+                    for index_spec in index_specs:
                         try:
                             collection.create_index(index_spec)
                             logger.debug(f"Created index {index_spec} on {collection_name}")
@@ -115,6 +115,10 @@ class MongoDBService:
         """Bulk insert multiple documents for better performance"""
         return self.operations.bulk_insert_metrics(collection_name, documents)
     
+    def bulk_write_metric_families(self, families: Dict[str, List[Dict]]) -> int:
+        """Bulk insert or upsert documents for several collections in as few round-trips as possible"""
+        return self.operations.bulk_write_metric_families(families)
+    
     # Query methods (delegated to queries)
     def get_metrics_summary(self, start_time: datetime = None, end_time: datetime = None) -> Dict:
         """Get a summary of metrics for a time range"""
@@ -10,6 +10,10 @@ class DatabaseConfig:
     user: str = os.getenv('MYSQL_USER', 'rmf_user')
     password: str = os.getenv('MYSQL_PASSWORD', 'rmf_password')
     root_password: str = os.getenv('MYSQL_ROOT_PASSWORD', 'root_password')
+    pool_name: str = os.getenv('MYSQL_POOL_NAME', 'rmf_pool')
+    pool_size: int = int(os.getenv('MYSQL_POOL_SIZE', '8'))
+    # zlib compress the protocol, bulk INSERT statements are mostly repetitive text
+    compress: bool = os.getenv('MYSQL_COMPRESS', 'true').lower() == 'true'
     
     def get_connection_params(self) -> dict:
         """Get connection parameters as dictionary"""
@@ -19,7 +23,18 @@ class DatabaseConfig:
             'database': self.database,
             'user': self.user,
             'password': self.password,
-            'autocommit': True
+            'autocommit': True,
+            'compress': self.compress
+        }
+    
+    def get_pool_params(self) -> dict:
+        """Get connection pool parameters as dictionary"""
+        return {
+            'pool_name': self.pool_name,
+            'pool_size': self.pool_size,
+            # Sessions are not modified by callers, skip the reset round-trip on checkout
+            'pool_reset_session': False,
+            **self.get_connection_params()
         }
     
     def get_root_connection_params(self) -> dict:
@@ -1,5 +1,6 @@
+import threading
 import mysql.connector
-from mysql.connector import Error
+from mysql.connector import Error, pooling
 from contextlib import contextmanager
 from utils.logger import logger
 from .config import DatabaseConfig
@@ -9,6 +10,27 @@ class DatabaseConnection:
     
     def __init__(self, config: DatabaseConfig = None):
         self.config = config or DatabaseConfig()
+        self._pool = None
+        self._pool_lock = threading.Lock()
+        self._local = threading.local()
+    
+    def _get_pool(self) -> pooling.MySQLConnectionPool:
+        """Create the connection pool on first use"""
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    self._pool = pooling.MySQLConnectionPool(**self.config.get_pool_params())
+                    logger.info(f"Created MySQL connection pool '{self.config.pool_name}' "
+                                f"with {self.config.pool_size} connections")
+        return self._pool
+    
+    def close_pool(self):
+        """Close every idle pooled connection, a new pool is created on next use"""
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool._remove_connections()
+                self._pool = None
+                logger.info("MySQL connection pool closed")
     
     def _get_root_connection(self):
         """Get connection as root to create database and user"""
@@ -23,20 +45,40 @@ class DatabaseConnection:
     
     @contextmanager
     def get_connection(self):
-        """Get a database connection with automatic cleanup"""
+        """Check out a pooled database connection and return it afterwards"""
+        shared_connection = getattr(self._local, 'connection', None)
+        if shared_connection is not None:
+            # Inside transaction(): reuse the connection already checked out by this thread
+            yield shared_connection
+            return
+        
         connection = None
         try:
-            connection = mysql.connector.connect(
-                **self.config.get_connection_params()
-            )
+            connection = self._get_pool().get_connection()
             yield connection
         except Error as e:
             logger.error(f"Database connection error: {e}")
             raise
         finally:
-            if connection and connection.is_connected():
+            if connection:
+                # close() on a pooled connection hands it back to the pool
                 connection.close()
     
+    @contextmanager
+    def transaction(self):
+        """Run all get_connection() calls of this thread on one connection and commit once"""
+        with self.get_connection() as connection:
+            self._local.connection = connection
+            try:
+                connection.start_transaction()
+                yield connection
+                connection.commit()
+            except Exception:
+                connection.rollback()
+                raise
+            finally:
+                self._local.connection = None
+    
     def test_connection(self) -> bool:
         """Test if database connection is working"""
         try:
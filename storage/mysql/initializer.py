@@ -7,9 +7,9 @@ from .config import DatabaseConfig
 class DatabaseInitializer:
     """Handles database and table initialization"""
     
-    def __init__(self, config: DatabaseConfig = None):
+    def __init__(self, config: DatabaseConfig = None, connection_manager: DatabaseConnection = None):
         self.config = config or DatabaseConfig()
-        self.connection_manager = DatabaseConnection(config)
+        self.connection_manager = connection_manager or DatabaseConnection(config)
     
     def initialize_database(self):
         """Initialize database, user, and tables if they don't exist"""
@@ -8,8 +8,8 @@ from .schema import TABLE_NAMES
 class MaintenanceDAO:
     """Data Access Object for maintenance operations"""
     
-    def __init__(self, config: DatabaseConfig = None):
-        self.connection_manager = DatabaseConnection(config)
+    def __init__(self, config: DatabaseConfig = None, connection_manager: DatabaseConnection = None):
+        self.connection_manager = connection_manager or DatabaseConnection(config)
     
     def cleanup_old_data(self, days_to_keep: int = 90):
         """Clean up old data beyond retention period"""
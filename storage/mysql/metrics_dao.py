@@ -1,4 +1,5 @@
 from datetime import datetime
+from typing import List, Tuple
 from mysql.connector import Error
 from utils.logger import logger
 from .connection import DatabaseConnection
@@ -7,8 +8,8 @@ from .config import DatabaseConfig
 class MetricsDAO:
     """Data Access Object for metrics operations"""
     
-    def __init__(self, config: DatabaseConfig = None):
-        self.connection_manager = DatabaseConnection(config)
+    def __init__(self, config: DatabaseConfig = None, connection_manager: DatabaseConnection = None):
+        self.connection_manager = connection_manager or DatabaseConnection(config)
     
     def insert_cpu_metric(self, timestamp: datetime, sysplex: str, lpar: str, 
                          cpu_type: str, utilization_percent: float):
@@ -200,4 +201,115 @@ class MetricsDAO:
                 
         except Error as e:
             logger.error(f"Error inserting volumes IOPS metric: {e}")
-            raise
\ No newline at end of file
+            raise
+
+    # Bulk insertion methods (one executemany round-trip per metric family)
+    def _insert_many(self, query: str, rows: List[Tuple], metric_name: str):
+        """Insert multiple rows with a single executemany call"""
+        if not rows:
+            return
+        try:
+            with self.connection_manager.get_connection() as connection:
+                cursor = connection.cursor()
+                cursor.executemany(query, rows)
+                cursor.close()
+                
+        except Error as e:
+            logger.error(f"Error bulk inserting {metric_name} metrics: {e}")
+            raise
+    
+    def insert_cpu_metrics_bulk(self, rows: List[Tuple]):
+        """Insert multiple CPU utilization metrics"""
+        self._insert_many("""
+            INSERT INTO cpu_metrics 
+            (timestamp, sysplex, lpar, cpu_type, utilization_percent)
+            VALUES (%s, %s, %s, %s, %s)
+        """, rows, "CPU")
+    
+    def insert_memory_metrics_bulk(self, rows: List[Tuple]):
+        """Insert multiple memory usage metrics"""
+        self._insert_many("""
+            INSERT INTO memory_metrics 
+            (timestamp, sysplex, lpar, memory_type, usage_bytes)
+            VALUES (%s, %s, %s, %s, %s)
+        """, rows, "memory")
+    
+    def insert_ldev_utilization_metrics_bulk(self, rows: List[Tuple]):
+        """Insert multiple LDEV utilization metrics"""
+        self._insert_many("""
+            INSERT INTO ldev_utilization_metrics 
+            (timestamp, sysplex, lpar, device_id, utilization_percent)
+            VALUES (%s, %s, %s, %s, %s)
+        """, rows, "LDEV utilization")
+    
+    def insert_ldev_response_time_metrics_bulk(self, rows: List[Tuple]):
+        """Insert multiple LDEV response time metrics"""
+        self._insert_many("""
+            INSERT INTO ldev_response_time_metrics 
+            (timestamp, sysplex, lpar, device_type, response_time_seconds)
+            VALUES (%s, %s, %s, %s, %s)
+        """, rows, "LDEV response time")
+    
+    def insert_clpr_service_time_metrics_bulk(self, rows: List[Tuple]):
+        """Insert multiple CLPR service time metrics"""
+        self._insert_many("""
+            INSERT INTO clpr_service_time_metrics 
+            (timestamp, sysplex, lpar, cf_link, service_time_microseconds)
+            VALUES (%s, %s, %s, %s, %s)
+        """, rows, "CLPR service time")
+    
+    def insert_clpr_request_rate_metrics_bulk(self, rows: List[Tuple]):
+        """Insert multiple CLPR request rate metrics"""
+        self._insert_many("""
+            INSERT INTO clpr_request_rate_metrics 
+            (timestamp, sysplex, lpar, cf_link, request_type, request_rate)
+            VALUES (%s, %s, %s, %s, %s, %s)
+        """, rows, "CLPR request rate")
+    
+    def insert_mpb_processing_rate_metrics_bulk(self, rows: List[Tuple]):
+        """Insert multiple MPB processing rate metrics"""
+        self._insert_many("""
+            INSERT INTO mpb_processing_rate_metrics 
+            (timestamp, sysplex, lpar, queue_type, processing_rate)
+            VALUES (%s, %s, %s, %s, %s)
+        """, rows, "MPB processing rate")
+    
+    def insert_mpb_queue_depth_metrics_bulk(self, rows: List[Tuple]):
+        """Insert multiple MPB queue depth metrics"""
+        self._insert_many("""
+            INSERT INTO mpb_queue_depth_metrics 
+            (timestamp, sysplex, lpar, queue_type, queue_depth)
+            VALUES (%s, %s, %s, %s, %s)
+        """, rows, "MPB queue depth")
+    
+    def insert_ports_utilization_metrics_bulk(self, rows: List[Tuple]):
+        """Insert multiple ports utilization metrics"""
+        self._insert_many("""
+            INSERT INTO ports_utilization_metrics 
+            (timestamp, sysplex, lpar, port_type, port_id, utilization_percent)
+            VALUES (%s, %s, %s, %s, %s, %s)
+        """, rows, "ports utilization")
+    
+    def insert_ports_throughput_metrics_bulk(self, rows: List[Tuple]):
+        """Insert multiple ports throughput metrics"""
+        self._insert_many("""
+            INSERT INTO ports_throughput_metrics 
+            (timestamp, sysplex, lpar, port_type, port_id, throughput_mbps)
+            VALUES (%s, %s, %s, %s, %s, %s)
+        """, rows, "ports throughput")
+    
+    def insert_volumes_utilization_metrics_bulk(self, rows: List[Tuple]):
+        """Insert multiple volumes utilization metrics"""
+        self._insert_many("""
+            INSERT INTO volumes_utilization_metrics 
+            (timestamp, sysplex, lpar, volume_type, volume_id, utilization_percent)
+            VALUES (%s, %s, %s, %s, %s, %s)
+        """, rows, "volumes utilization")
+    
+    def insert_volumes_iops_metrics_bulk(self, rows: List[Tuple]):
+        """Insert multiple volumes IOPS metrics"""
+        self._insert_many("""
+            INSERT INTO volumes_iops_metrics 
+            (timestamp, sysplex, lpar, volume_type, volume_id, iops)
+            VALUES (%s, %s, %s, %s, %s, %s)
+        """, rows, "volumes IOPS")
\ No newline at end of file
@@ -9,8 +9,8 @@ from .schema import TABLE_NAMES
 class QueryDAO:
     """Data Access Object for query operations"""
     
-    def __init__(self, config: DatabaseConfig = None):
-        self.connection_manager = DatabaseConnection(config)
+    def __init__(self, config: DatabaseConfig = None, connection_manager: DatabaseConnection = None):
+        self.connection_manager = connection_manager or DatabaseConnection(config)
     
     def get_metrics_summary(self, start_time: datetime = None, end_time: datetime = None) -> Dict:
         """Get a summary of metrics for a time range"""
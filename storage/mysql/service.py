@@ -1,7 +1,8 @@
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from utils.logger import logger
 from .config import DatabaseConfig
+from .connection import DatabaseConnection
 from .initializer import DatabaseInitializer
 from .metrics_dao import MetricsDAO
 from .query_dao import QueryDAO
@@ -13,11 +14,12 @@ class DatabaseService:
     def __init__(self, config: DatabaseConfig = None):
         self.config = config or DatabaseConfig()
         
-        # Initialize components
-        self.initializer = DatabaseInitializer(self.config)
-        self.metrics_dao = MetricsDAO(self.config)
-        self.query_dao = QueryDAO(self.config)
-        self.maintenance_dao = MaintenanceDAO(self.config)
+        # Initialize components sharing one connection pool
+        self.connection_manager = DatabaseConnection(self.config)
+        self.initializer = DatabaseInitializer(self.config, self.connection_manager)
+        self.metrics_dao = MetricsDAO(self.config, self.connection_manager)
+        self.query_dao = QueryDAO(self.config, self.connection_manager)
+        self.maintenance_dao = MaintenanceDAO(self.config, self.connection_manager)
         
         # Initialize database on startup
         self.initialize_database()
@@ -92,6 +94,59 @@ class DatabaseService:
         """Insert volumes IOPS metric"""
         return self.metrics_dao.insert_volumes_iops_metric(timestamp, sysplex, lpar, volume_type, volume_id, iops)
     
+    # Bulk insertion methods (delegate to MetricsDAO)
+    def bulk_transaction(self):
+        """Context manager that groups several bulk inserts into one pooled connection and commit"""
+        return self.connection_manager.transaction()
+    
+    def insert_cpu_metrics_bulk(self, rows: List[Tuple]):
+        """Insert multiple CPU utilization metrics in one round-trip"""
+        return self.metrics_dao.insert_cpu_metrics_bulk(rows)
+    
+    def insert_memory_metrics_bulk(self, rows: List[Tuple]):
+        """Insert multiple memory usage metrics in one round-trip"""
+        return self.metrics_dao.insert_memory_metrics_bulk(rows)
+    
+    def insert_ldev_utilization_metrics_bulk(self, rows: List[Tuple]):
+        """Insert multiple LDEV utilization metrics in one round-trip"""
+        return self.metrics_dao.insert_ldev_utilization_metrics_bulk(rows)
+    
+    def insert_ldev_response_time_metrics_bulk(self, rows: List[Tuple]):
+        """Insert multiple LDEV response time metrics in one round-trip"""
+        return self.metrics_dao.insert_ldev_response_time_metrics_bulk(rows)
+    
+    def insert_clpr_service_time_metrics_bulk(self, rows: List[Tuple]):
+        """Insert multiple CLPR service time metrics in one round-trip"""
+        return self.metrics_dao.insert_clpr_service_time_metrics_bulk(rows)
+    
+    def insert_clpr_request_rate_metrics_bulk(self, rows: List[Tuple]):
+        """Insert multiple CLPR request rate metrics in one round-trip"""
+        return self.metrics_dao.insert_clpr_request_rate_metrics_bulk(rows)
+    
+    def insert_mpb_processing_rate_metrics_bulk(self, rows: List[Tuple]):
+        """Insert multiple MPB processing rate metrics in one round-trip"""
+        return self.metrics_dao.insert_mpb_processing_rate_metrics_bulk(rows)
+    
+    def insert_mpb_queue_depth_metrics_bulk(self, rows: List[Tuple]):
+        """Insert multiple MPB queue depth metrics in one round-trip"""
+        return self.metrics_dao.insert_mpb_queue_depth_metrics_bulk(rows)
+    
+    def insert_ports_utilization_metrics_bulk(self, rows: List[Tuple]):
+        """Insert multiple ports utilization metrics in one round-trip"""
+        return self.metrics_dao.insert_ports_utilization_metrics_bulk(rows)
+    
+    def insert_ports_throughput_metrics_bulk(self, rows: List[Tuple]):
+        """Insert multiple ports throughput metrics in one round-trip"""
+        return self.metrics_dao.insert_ports_throughput_metrics_bulk(rows)
+    
+    def insert_volumes_utilization_metrics_bulk(self, rows: List[Tuple]):
+        """Insert multiple volumes utilization metrics in one round-trip"""
+        return self.metrics_dao.insert_volumes_utilization_metrics_bulk(rows)
+    
+    def insert_volumes_iops_metrics_bulk(self, rows: List[Tuple]):
+        """Insert multiple volumes IOPS metrics in one round-trip"""
+        return self.metrics_dao.insert_volumes_iops_metrics_bulk(rows)
+    
     # Query methods (delegate to QueryDAO)
     def get_metrics_summary(self, start_time: datetime = None, end_time: datetime = None) -> Dict:
         """Get a summary of metrics for a time range"""
@@ -222,6 +277,10 @@ class DatabaseService:
         """Test if database connection is working"""
         return self.metrics_dao.connection_manager.test_connection()
     
+    def close_connection(self):
+        """Close all pooled database connections"""
+        self.connection_manager.close_pool()
+    
     def drop_all_tables(self):
         """Drop all tables (use with caution)"""
         return self.initializer.drop_all_tables()
\ No newline at end of file
@@ -0,0 +1,27 @@
+# storage/services.py
+from functools import lru_cache
+
+from storage.S3.s3 import S3StorageService
+from storage.mongodb.service import MongoDBService
+from storage.mysql.service import DatabaseService
+
+
+# One instance of each service per process, shared by the API routes and the StorageManager.
+# lru_cache does not cache exceptions, so a backend that is down is retried on the next call.
+
+@lru_cache(maxsize=1)
+def get_database_service() -> DatabaseService:
+    """MySQL service, connected on first use"""
+    return DatabaseService()
+
+
+@lru_cache(maxsize=1)
+def get_mongo_service() -> MongoDBService:
+    """MongoDB service, connected on first use"""
+    return MongoDBService()
+
+
+@lru_cache(maxsize=1)
+def get_s3_service() -> S3StorageService:
+    """S3 service, connected on first use"""
+    return S3StorageService()
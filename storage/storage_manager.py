@@ -1,14 +1,40 @@
 # storage/storage_manager.py
+from collections import defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from datetime import datetime
-from typing import Dict, Any, List, Optional
+from time import monotonic
+from typing import Dict, List, Optional, Tuple
+import atexit
+import logging
+import queue
 import threading
 
+
+from models.metrics import MetricBatch
 from storage.S3.s3 import S3StorageService
 from storage.mysql.service import DatabaseService
 from storage.mongodb.service import MongoDBService
+from storage.services import get_database_service, get_mongo_service, get_s3_service
 from utils.logger import logger
 
 
+# metric_type -> (MySQL table / MongoDB collection, metric specific columns in insert order)
+METRIC_SCHEMAS: Dict[str, Tuple[str, Tuple[str, ...]]] = {
+    'cpu_utilization': ('cpu_metrics', ('cpu_type', 'utilization_percent')),
+    'memory_usage': ('memory_metrics', ('memory_type', 'usage_bytes')),
+    'ldev_response_time': ('ldev_response_time_metrics', ('device_type', 'response_time_seconds')),
+    'ldev_utilization': ('ldev_utilization_metrics', ('device_id', 'utilization_percent')),
+    'ports_utilization': ('ports_utilization_metrics', ('port_type', 'port_id', 'utilization_percent')),
+    'ports_throughput': ('ports_throughput_metrics', ('port_type', 'port_id', 'throughput_mbps')),
+    'clpr_service_time': ('clpr_service_time_metrics', ('cf_link', 'service_time_microseconds')),
+    'clpr_request_rate': ('clpr_request_rate_metrics', ('cf_link', 'request_type', 'request_rate')),
+    'mpb_processing_rate': ('mpb_processing_rate_metrics', ('queue_type', 'processing_rate')),
+    'mpb_queue_depth': ('mpb_queue_depth_metrics', ('queue_type', 'queue_depth')),
+    'volumes_utilization': ('volumes_utilization_metrics', ('volume_type', 'volume_id', 'utilization_percent')),
+    'volumes_iops': ('volumes_iops_metrics', ('volume_type', 'volume_id', 'iops')),
+}
+
+
 class StorageManager:
     """Manages storage operations across multiple storage backends"""
     
@@ -18,242 +44,363 @@ class StorageManager:
         self.s3_service: Optional[S3StorageService] = None
         
         # S3 batching configuration
-        self.s3_batch_buffer: List[Dict[str, Any]] = []
-        self.s3_batch_size = 50
-        self.last_s3_flush = datetime.now()
+        self.s3_batch_buffer: List[MetricBatch] = []
+        self.s3_batch_max_bytes = 4 * 1024 * 1024  # flush once ~4MB of JSON is buffered
+        self.s3_record_bytes = 180  # average NDJSON record size, estimates the buffer size without serializing it
+        self._s3_batch_bytes = 0
+        self.last_s3_flush = monotonic()  # monotonic clock, immune to wall-clock jumps
         self.s3_flush_interval = 60  # seconds
         self._buffer_lock = threading.Lock()
         
-        self._initialize_services(enable_mysql, enable_mongodb, enable_s3)
-    
-    def _initialize_services(self, enable_mysql: bool, enable_mongodb: bool, enable_s3: bool):
-        """Initialize storage services based on configuration"""
-        if enable_mysql:
-            try:
-                self.db_service = DatabaseService()
-                logger.info("MySQL storage service initialized")
-            except Exception as e:
-                logger.error(f"Failed to initialize MySQL service: {e}")
+        # Batches are uploaded by a background writer so S3 latency never blocks simulation
+        self.s3_queue_size = 100
+        self.s3_enqueue_timeout = 1.0  # seconds
+        self._s3_queue: "queue.Queue[Optional[List[MetricBatch]]]" = queue.Queue(maxsize=self.s3_queue_size)
+        self._s3_writer: Optional[threading.Thread] = None
+        self._s3_writer_lock = threading.Lock()
         
-        if enable_mongodb:
-            try:
-                self.mongo_service = MongoDBService()
-                logger.info("MongoDB storage service initialized")
-            except Exception as e:
-                logger.error(f"Failed to initialize MongoDB service: {e}")
+        # Whole simulation cycles are handed to a background store worker, the simulation never waits on storage
+        self.store_queue_size = 8  # cycles
+        self._store_queue: "queue.Queue[Optional[List[MetricBatch]]]" = queue.Queue(maxsize=self.store_queue_size)
+        self._store_worker: Optional[threading.Thread] = None
+        self._store_worker_lock = threading.Lock()
+        # Interpreter exit without close() still writes everything that was buffered
+        atexit.register(self._drain)
         
-        if enable_s3:
+        # MySQL/MongoDB rows are buffered across cycles and written once enough rows or time accumulated
+        self._db_buffer: Dict[str, Tuple[str, Tuple[str, ...], List[Tuple]]] = {}
+        self._db_buffer_rows = 0
+        self.db_batch_rows = 1800  # about two simulation cycles
+        self.last_db_flush = monotonic()
+        self.db_flush_interval = 30  # seconds, about two simulation ticks
+        self._db_buffer_lock = threading.Lock()
+        
+        # Pool used to write to MySQL and MongoDB in parallel, off the simulation path
+        self._io_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="storage-io")
+        self._pending_writes: List[Future] = []
+        self._pending_writes_lock = threading.Lock()
+        
+        # Services connect in start(), so creating the manager never blocks on a backend
+        self.enable_mysql = enable_mysql
+        self.enable_mongodb = enable_mongodb
+        self.enable_s3 = enable_s3
+        self.started = False
+        self._start_lock = threading.Lock()
+    
+    def start(self):
+        """Connect the enabled storage services concurrently, later calls are no-ops"""
+        with self._start_lock:
+            if self.started:
+                return
+            
+            futures = {}
+            if self.enable_mysql:
+                futures['mysql'] = self._io_pool.submit(self._initialize_service, "MySQL", get_database_service)
+            if self.enable_mongodb:
+                futures['mongodb'] = self._io_pool.submit(self._initialize_service, "MongoDB", get_mongo_service)
+            if self.enable_s3:
+                futures['s3'] = self._io_pool.submit(self._initialize_service, "S3", get_s3_service)
+            
+            if 'mysql' in futures:
+                self.db_service = futures['mysql'].result()
+            if 'mongodb' in futures:
+                self.mongo_service = futures['mongodb'].result()
+            if 's3' in futures:
+                self.s3_service = futures['s3'].result()
+            self.started = True
+    
+    def _initialize_service(self, name: str, get_service):
+        """Get one shared storage service, returns None when the backend is unavailable"""
+        try:
+            service = get_service()
+            logger.info(f"{name} storage service initialized")
+            return service
+        except Exception as e:
+            logger.error(f"Failed to initialize {name} service: {e}")
+            return None
+    
+    def submit_metrics(self, metrics: List[MetricBatch]):
+        """Queue one cycle of metrics for the background store worker without blocking"""
+        self._ensure_store_worker()
+        try:
+            self._store_queue.put_nowait(metrics)
+        except queue.Full:
+            logger.error(f"Store queue is full, dropping cycle of {sum(map(len, metrics))} metrics")
+    
+    def _ensure_store_worker(self):
+        """Start the background store worker thread if it is not running"""
+        with self._store_worker_lock:
+            if self._store_worker is None or not self._store_worker.is_alive():
+                self._store_worker = threading.Thread(target=self._store_worker_loop, name="storage-writer", daemon=True)
+                self._store_worker.start()
+    
+    def _store_worker_loop(self):
+        """Store queued cycles and flush due buffers until a stop sentinel is received"""
+        while True:
+            metrics = self._store_queue.get()
             try:
-                self.s3_service = S3StorageService()
-                logger.info("S3 storage service initialized")
+                if metrics is None:
+                    return
+                if metrics:
+                    self.store_metrics(metrics)
+                self.flush_due()
             except Exception as e:
-                logger.error(f"Failed to initialize S3 service: {e}")
+                logger.error(f"Error storing metrics cycle: {e}")
+            finally:
+                self._store_queue.task_done()
     
-    def store_metrics(self, metrics: List[Dict[str, Any]]):
+    def _stop_store_worker(self, timeout: float = 30.0):
+        """Store the queued cycles and stop the worker thread"""
+        worker = self._store_worker
+        if worker is None or not worker.is_alive():
+            return
+        
+        self._store_queue.put(None)
+        worker.join(timeout)
+        if worker.is_alive():
+            logger.warning("Store worker did not finish draining before shutdown timeout")
+    
+    def store_metrics(self, metrics: List[MetricBatch]):
         """Store metrics to all enabled storage backends"""
-        for metric in metrics:
-            self._store_to_databases(metric)
-            self._store_to_s3_batch(metric)
+        if self.db_service or self.mongo_service:
+            self._buffer_database_rows(self._group_database_rows(metrics))
+        
+        self._store_to_s3_batch(metrics)
     
-    def _store_to_databases(self, metric: Dict[str, Any]):
-        """Store metric to MySQL and MongoDB"""
-        metric_type = metric.get('metric_type')
-        timestamp = datetime.fromisoformat(metric['timestamp'])
+    def _buffer_database_rows(self, families: Dict[str, Tuple[str, Tuple[str, ...], List[Tuple]]]):
+        """Add grouped rows to the database buffer and write it out once it is full or old enough"""
+        with self._db_buffer_lock:
+            for metric_type, (table, fields, rows) in families.items():
+                buffered = self._db_buffer.get(metric_type)
+                if buffered is None:
+                    self._db_buffer[metric_type] = (table, fields, rows)
+                else:
+                    buffered[2].extend(rows)
+                self._db_buffer_rows += len(rows)
+            
+            if (self._db_buffer_rows < self.db_batch_rows and
+                monotonic() - self.last_db_flush < self.db_flush_interval):
+                return
+            families = self._take_db_buffer()
         
-        try:
-            # Store to MySQL
-            if self.db_service:
-                self._store_to_mysql(metric, metric_type, timestamp)
+        self._write_database_rows(families)
+    
+    def _take_db_buffer(self) -> Dict[str, Tuple[str, Tuple[str, ...], List[Tuple]]]:
+        """Swap the database buffer for an empty one, caller must hold _db_buffer_lock"""
+        families = self._db_buffer
+        self._db_buffer = {}
+        self._db_buffer_rows = 0
+        self.last_db_flush = monotonic()
+        return families
+    
+    def _write_database_rows(self, families: Dict[str, Tuple[str, Tuple[str, ...], List[Tuple]]]):
+        """Submit buffered families to MySQL and MongoDB without waiting for the writes"""
+        if not families:
+            return
+        
+        with self._pending_writes_lock:
+            # Keep at most one batch in flight so a slow database applies backpressure
+            self._wait_pending_writes()
             
-            # Store to MongoDB
+            # MySQL and MongoDB writes are independent, run them concurrently
+            if self.db_service:
+                self._submit_write(self._store_to_mysql, families)
             if self.mongo_service:
-                self._store_to_mongodb(metric, metric_type, timestamp)
-                
-        except Exception as e:
-            logger.error(f"Error storing metric to databases: {e}")
+                self._submit_write(self._store_to_mongodb, families)
+    
+    def _submit_write(self, store, families: Dict[str, Tuple[str, Tuple[str, ...], List[Tuple]]]):
+        """Run one backend write on the I/O pool, caller must hold _pending_writes_lock"""
+        try:
+            self._pending_writes.append(self._io_pool.submit(store, families))
+        except RuntimeError:
+            # The pool refuses new work once the interpreter is shutting down, the atexit flush writes inline
+            store(families)
+    
+    def _wait_pending_writes(self):
+        """Wait for submitted database writes, caller must hold _pending_writes_lock"""
+        if not self._pending_writes:
+            return
+        
+        wait(self._pending_writes)
+        for future in self._pending_writes:
+            if future.exception() is not None:
+                logger.error(f"Error writing metrics to database: {future.exception()}")
+        self._pending_writes = []
     
-    def _store_to_mysql(self, metric: Dict[str, Any], metric_type: str, timestamp: datetime):
-        """Store metric to MySQL based on metric type"""
-        sysplex = metric['sysplex']
-        lpar = metric['lpar']
+    def _group_database_rows(self, metrics: List[MetricBatch]) -> Dict[str, Tuple[str, Tuple[str, ...], List[Tuple]]]:
+        """Group metric batches by type into (table, fields, row tuples) for bulk writes"""
+        grouped: Dict[str, List[MetricBatch]] = defaultdict(list)
+        for batch in metrics:
+            grouped[batch.metric_type].append(batch)
+        
+        families = {}
+        timestamps: Dict[str, datetime] = {}
+        for metric_type, group in grouped.items():
+            schema = METRIC_SCHEMAS.get(metric_type)
+            if schema is None:
+                logger.warning(f"No storage schema for metric type: {metric_type}")
+                continue
+            
+            table, fields = schema
+            rows = []
+            for batch in group:
+                # Batches from one simulation cycle share a timestamp, parse it once
+                iso_timestamp = batch.timestamp
+                timestamp = timestamps.get(iso_timestamp)
+                if timestamp is None:
+                    timestamp = timestamps[iso_timestamp] = datetime.fromisoformat(iso_timestamp)
+                sysplex, lpar = batch.sysplex, batch.lpar
+                rows.extend(
+                    (timestamp, sysplex, lpar, *values)
+                    for values in zip(*(batch.columns[field] for field in fields))
+                )
+            families[metric_type] = (table, fields, rows)
         
-        if metric_type == 'cpu_utilization':
-            self.db_service.insert_cpu_metric(
-                timestamp, sysplex, lpar, 
-                metric['cpu_type'], metric['utilization_percent']
-            )
-        elif metric_type == 'memory_usage':
-            self.db_service.insert_memory_metric(
-                timestamp, sysplex, lpar,
-                metric['memory_type'], metric['usage_bytes']
-            )
-        elif metric_type == 'ldev_response_time':
-            self.db_service.insert_ldev_response_time_metric(
-                timestamp, sysplex, lpar,
-                metric['device_type'], metric['response_time_seconds']
-            )
-        elif metric_type == 'ldev_utilization':
-            self.db_service.insert_ldev_utilization_metric(
-                timestamp, sysplex, lpar,
-                metric['device_id'], metric['utilization_percent']
-            )
-        elif metric_type == 'ports_utilization':
-            self.db_service.insert_ports_utilization_metric(
-                timestamp, sysplex, lpar,
-                metric['port_type'], metric['port_id'], metric['utilization_percent']
-            )
-        elif metric_type == 'ports_throughput':
-            self.db_service.insert_ports_throughput_metric(
-                timestamp, sysplex, lpar,
-                metric['port_type'], metric['port_id'], metric['throughput_mbps']
-            )
-        elif metric_type == 'clpr_service_time':
-            self.db_service.insert_clpr_service_time_metric(
-                timestamp, sysplex, lpar,
-                metric['cf_link'], metric['service_time_microseconds']
-            )
-        elif metric_type == 'clpr_request_rate':
-            self.db_service.insert_clpr_request_rate_metric(
-                timestamp, sysplex, lpar,
-                metric['cf_link'], metric['request_type'], metric['request_rate']
-            )
-        elif metric_type == 'mpb_processing_rate':
-            self.db_service.insert_mpb_processing_rate_metric(
-                timestamp, sysplex, lpar,
-                metric['queue_type'], metric['processing_rate']
-            )
-        elif metric_type == 'mpb_queue_depth':
-            self.db_service.insert_mpb_queue_depth_metric(
-                timestamp, sysplex, lpar,
-                metric['queue_type'], metric['queue_depth']
-            )
-        elif metric_type == 'volumes_utilization':
-            self.db_service.insert_volumes_utilization_metric(
-                timestamp, sysplex, lpar,
-                metric['volume_type'], metric['volume_id'], metric['utilization_percent']
-            )
-        elif metric_type == 'volumes_iops':
-            self.db_service.insert_volumes_iops_metric(
-                timestamp, sysplex, lpar,
-                metric['volume_type'], metric['volume_id'], metric['iops']
-            )
+        return families
     
-    def _store_to_mongodb(self, metric: Dict[str, Any], metric_type: str, timestamp: datetime):
-        """Store metric to MongoDB based on metric type"""
-        sysplex = metric['sysplex']
-        lpar = metric['lpar']
+    def _store_to_mysql(self, families: Dict[str, Tuple[str, Tuple[str, ...], List[Tuple]]]):
+        """Store each metric family to MySQL with a single executemany, all in one transaction"""
+        try:
+            with self.db_service.bulk_transaction():
+                for table, _, rows in families.values():
+                    # Bulk methods are named after their table, e.g. insert_cpu_metrics_bulk
+                    getattr(self.db_service, f"insert_{table}_bulk")(rows)
+        except Exception as e:
+            # The transaction is rolled back as a whole, so the batch fails once
+            row_count = sum(len(rows) for _, _, rows in families.values())
+            logger.error(f"Error storing batch of {row_count} metrics to MySQL: {e}")
+    
+    def _store_to_mongodb(self, families: Dict[str, Tuple[str, Tuple[str, ...], List[Tuple]]]):
+        """Store all metric families to MongoDB in one bulk write"""
+        documents = {}
+        for collection, fields, rows in families.values():
+            columns = ('timestamp', 'sysplex', 'lpar') + fields
+            documents[collection] = [dict(zip(columns, row)) for row in rows]
         
-        if metric_type == 'cpu_utilization':
-            self.mongo_service.insert_cpu_metric(
-                timestamp, sysplex, lpar,
-                metric['cpu_type'], metric['utilization_percent']
-            )
-        elif metric_type == 'memory_usage':
-            self.mongo_service.insert_memory_metric(
-                timestamp, sysplex, lpar,
-                metric['memory_type'], metric['usage_bytes']
-            )
-        elif metric_type == 'ldev_response_time':
-            self.mongo_service.insert_ldev_response_time_metric(
-                timestamp, sysplex, lpar,
-                metric['device_type'], metric['response_time_seconds']
-            )
-        elif metric_type == 'ldev_utilization':
-            self.mongo_service.insert_ldev_utilization_metric(
-                timestamp, sysplex, lpar,
-                metric['device_id'], metric['utilization_percent']
-            )
-        elif metric_type == 'ports_utilization':
-            self.mongo_service.insert_ports_utilization_metric(
-                timestamp, sysplex, lpar,
-                metric['port_type'], metric['port_id'], metric['utilization_percent']
-            )
-        elif metric_type == 'ports_throughput':
-            self.mongo_service.insert_ports_throughput_metric(
-                timestamp, sysplex, lpar,
-                metric['port_type'], metric['port_id'], metric['throughput_mbps']
-            )
-        elif metric_type == 'clpr_service_time':
-            self.mongo_service.insert_clpr_service_time_metric(
-                timestamp, sysplex, lpar,
-                metric['cf_link'], metric['service_time_microseconds']
-            )
-        elif metric_type == 'clpr_request_rate':
-            self.mongo_service.insert_clpr_request_rate_metric(
-                timestamp, sysplex, lpar,
-                metric['cf_link'], metric['request_type'], metric['request_rate']
-            )
-        elif metric_type == 'mpb_processing_rate':
-            self.mongo_service.insert_mpb_processing_rate_metric(
-                timestamp, sysplex, lpar,
-                metric['queue_type'], metric['processing_rate']
-            )
-        elif metric_type == 'mpb_queue_depth':
-            self.mongo_service.insert_mpb_queue_depth_metric(
-                timestamp, sysplex, lpar,
-                metric['queue_type'], metric['queue_depth']
-            )
-        elif metric_type == 'volumes_utilization':
-            self.mongo_service.insert_volumes_utilization_metric(
-                timestamp, sysplex, lpar,
-                metric['volume_type'], metric['volume_id'], metric['utilization_percent']
-            )
-        elif metric_type == 'volumes_iops':
-            self.mongo_service.insert_volumes_iops_metric(
-                timestamp, sysplex, lpar,
-                metric['volume_type'], metric['volume_id'], metric['iops']
-            )
+        try:
+            self.mongo_service.bulk_write_metric_families(documents)
+        except Exception as e:
+            logger.error(f"Error storing metrics to MongoDB: {e}")
     
-    def _store_to_s3_batch(self, metric: Dict[str, Any]):
-        """Add metric to S3 batch buffer"""
-        if not self.s3_service:
+    def _store_to_s3_batch(self, metrics: List[MetricBatch]):
+        """Add metrics to S3 batch buffer"""
+        if not self.s3_service or not metrics:
             return
         
+        # Size batches by their estimated NDJSON payload, the records are serialized only once, at upload
+        batch_bytes = sum(map(len, metrics)) * self.s3_record_bytes
+        
         with self._buffer_lock:
-            self.s3_batch_buffer.append(metric)
+            self.s3_batch_buffer.extend(metrics)
+            self._s3_batch_bytes += batch_bytes
             
-            # Check if we need to flush the batch
-            current_time = datetime.now()
-            if (len(self.s3_batch_buffer) >= self.s3_batch_size or 
-                (current_time - self.last_s3_flush).total_seconds() > self.s3_flush_interval):
+            # Check once per call whether we need to flush the batch
+            if (self._s3_batch_bytes >= self.s3_batch_max_bytes or 
+                monotonic() - self.last_s3_flush > self.s3_flush_interval):
                 self._flush_s3_batch()
     
     def _flush_s3_batch(self):
-        """Flush the S3 batch buffer"""
+        """Hand the S3 batch buffer over to the background writer"""
         if not self.s3_service or not self.s3_batch_buffer:
             return
         
+        self._ensure_s3_writer()
+        batch = self.s3_batch_buffer
+        self.s3_batch_buffer = []
+        self._s3_batch_bytes = 0
+        self.last_s3_flush = monotonic()
+        
         try:
-            self.s3_service.batch_store_metrics(self.s3_batch_buffer.copy())
-            logger.debug(f"Flushed {len(self.s3_batch_buffer)} metrics to S3")
-            self.s3_batch_buffer.clear()
-            self.last_s3_flush = datetime.now()
-        except Exception as e:
-            logger.error(f"Error flushing S3 batch: {e}")
+            self._s3_queue.put(batch, timeout=self.s3_enqueue_timeout)
+        except queue.Full:
+            logger.error(f"S3 writer queue is full, dropping batch of {sum(map(len, batch))} metrics")
+    
+    def _ensure_s3_writer(self):
+        """Start the background S3 writer thread if it is not running"""
+        with self._s3_writer_lock:
+            if self._s3_writer is None or not self._s3_writer.is_alive():
+                self._s3_writer = threading.Thread(target=self._s3_writer_loop, name="s3-writer", daemon=True)
+                self._s3_writer.start()
+    
+    def _s3_writer_loop(self):
+        """Upload queued batches to S3 until a stop sentinel is received"""
+        while True:
+            batch = self._s3_queue.get()
+            try:
+                if batch is None:
+                    return
+                self.s3_service.batch_store_metrics(batch)
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"Flushed {sum(map(len, batch))} metrics to S3")
+            except Exception as e:
+                logger.error(f"Error flushing S3 batch: {e}")
+            finally:
+                self._s3_queue.task_done()
+    
+    def _stop_s3_writer(self, timeout: float = 30.0):
+        """Drain queued S3 batches and stop the writer thread"""
+        writer = self._s3_writer
+        if writer is None or not writer.is_alive():
+            return
+        
+        self._s3_queue.put(None)
+        writer.join(timeout)
+        if writer.is_alive():
+            logger.warning("S3 writer did not finish draining before shutdown timeout")
+    
+    def flush_due(self):
+        """Flush the buffers whose flush interval has elapsed"""
+        with self._db_buffer_lock:
+            families = None
+            if monotonic() - self.last_db_flush >= self.db_flush_interval:
+                families = self._take_db_buffer()
+        if families:
+            self._write_database_rows(families)
+        
+        with self._buffer_lock:
+            if monotonic() - self.last_s3_flush > self.s3_flush_interval:
+                self._flush_s3_batch()
     
     def force_flush(self):
         """Force flush all pending operations"""
+        # Cycles still queued for the store worker go into the buffers first
+        if self._store_worker is not None and self._store_worker.is_alive():
+            self._store_queue.join()
+        
+        with self._db_buffer_lock:
+            families = self._take_db_buffer()
+        self._write_database_rows(families)
+        with self._pending_writes_lock:
+            self._wait_pending_writes()
+        
         with self._buffer_lock:
             self._flush_s3_batch()
     
+    def _drain(self):
+        """Store the queued cycles, flush every buffer and stop the writer threads"""
+        self._stop_store_worker()
+        self.force_flush()
+        self._stop_s3_writer()
+    
     def close(self):
         """Clean up resources"""
-        self.force_flush()
+        self._drain()
+        self._io_pool.shutdown(wait=True)
         
         if self.db_service:
             try:
-                self.db_service.close()
+                self.db_service.close_connection()
             except Exception as e:
                 logger.error(f"Error closing MySQL service: {e}")
         
         if self.mongo_service:
             try:
-                self.mongo_service.close()
+                self.mongo_service.close_connection()
             except Exception as e:
                 logger.error(f"Error closing MongoDB service: {e}")
         
         if self.s3_service:
             try:
-                self.s3_service.close()
+                self.s3_service.close_connection()
             except Exception as e:
                 logger.error(f"Error closing S3 service: {e}")
\ No newline at end of file
@@ -0,0 +1,41 @@
+from datetime import datetime
+
+import pytest
+
+from storage.S3.s3 import S3Config, S3StorageService
+
+
+class SelectOnlyClient:
+    """Stub S3 client whose Select calls match no records"""
+
+    def __init__(self):
+        self.selects = []
+        self.gets = []
+
+    def select_object_content(self, **kwargs):
+        self.selects.append(kwargs)
+        return {'Payload': [{'Records': {'Payload': b''}}, {'End': {}}]}
+
+    def get_object(self, **kwargs):
+        self.gets.append(kwargs)
+        raise AssertionError("time filtered reads must not download the object")
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setattr(S3StorageService, 'initialize_storage', lambda self: None)
+    service = S3StorageService(S3Config(use_select=True, compression='gzip'))
+    service.s3_client = SelectOnlyClient()
+    yield service
+    service._io_executor.shutdown()
+
+
+@pytest.mark.parametrize('object_key', [
+    'metrics/cpu/SYSPLEX01/PROD01/2025/03/01/10/gp_20250301_100000.json.gz',
+    'metrics/batch/cpu_utilization/SYSPLEX01/2025/03/01/10/batch_20250301_100000_000000.json.gz',
+])
+def test_empty_select_result_yields_no_metrics(service, object_key):
+    metrics = service._fetch_metrics(object_key, start_time=datetime(2025, 3, 2))
+    assert metrics == []
+    assert len(service.s3_client.selects) == 1
+    assert service.s3_client.gets == []
@@ -0,0 +1,29 @@
+from datetime import datetime
+from typing import Optional, Tuple
+
+
+class TickClock:
+    """Holds the timestamp of the current simulation tick and its ISO string"""
+
+    def __init__(self):
+        # (timestamp, ISO string) in one attribute so worker threads always read a matching pair
+        self._tick: Tuple[Optional[datetime], Optional[str]] = (None, None)
+
+    def refresh(self) -> datetime:
+        """Start a new tick, reading the wall clock and formatting it once"""
+        now = datetime.now()
+        self._tick = (now, now.isoformat())
+        return now
+
+    def isoformat(self, timestamp: datetime) -> str:
+        """Return timestamp.isoformat(), reusing the cached string for the current tick"""
+        tick_timestamp, tick_iso = self._tick
+        if tick_timestamp is timestamp:
+            return tick_iso
+        # Timestamps outside the tick (e.g. passed by direct callers) become the cached tick
+        iso = timestamp.isoformat()
+        self._tick = (timestamp, iso)
+        return iso
+
+
+tick_clock = TickClock()